@@ -1,20 +1,53 @@
 """Tests for datapipeline wrapper class and manager."""
 
 import copy
+from datetime import datetime
 from unittest import TestCase
 
 import boto3
-from mock import Mock, MagicMock, patch
+from mock import Mock, MagicMock, patch, sentinel, ANY
+from moto import mock_datapipeline
+from pytz import utc
 
 from disco_aws_automation.disco_datapipeline import (
     AsiaqDataPipeline, AsiaqDataPipelineManager, template_to_boto, add_default_object_fields)
 from disco_aws_automation import exceptions as asiaq_exceptions
 
+# The only datapipeline client methods the manager calls; cheaper than speccing a real boto3 client
+_DP_METHODS = [
+    'list_pipelines', 'describe_pipelines', 'get_pipeline_definition', 'create_pipeline',
+    'put_pipeline_definition', 'delete_pipeline', 'activate_pipeline', 'deactivate_pipeline'
+]
+
 
 class DataPipelineTest(TestCase):
     "Unit tests for the data pipeline wrapper class."
     # pylint: disable=invalid-name
 
+    # setUpClass only reads shared, read-only data, so a parallel nose run may repeat it in each
+    # process and spread these tests across workers instead of running the class as one unit.
+    _multiprocess_can_split_ = True
+
+    # The dynamodb_backup template's objects and params, read on first use by _from_cached_template
+    _TEMPLATE = None
+
+    @classmethod
+    def setUpClass(cls):
+        # Bare pipeline for tests that only need name and description; shallow-copy it per test
+        cls._PROTOTYPE = AsiaqDataPipeline(name="asdf", description="qwerty")
+
+    def _from_cached_template(self, **kwargs):
+        "Call AsiaqDataPipeline.from_template for dynamodb_backup, using a copy of the cached template."
+        # Read and translate the template from disk only for the tests that use it, and only once
+        if DataPipelineTest._TEMPLATE is None:
+            template_pipeline = AsiaqDataPipeline.from_template(
+                name="asdf", description="qwerty", template_name="dynamodb_backup")
+            DataPipelineTest._TEMPLATE = (template_pipeline._objects, template_pipeline._params)
+        cached = copy.deepcopy(DataPipelineTest._TEMPLATE)
+        with patch('disco_aws_automation.disco_datapipeline._read_template', return_value=cached):
+            return AsiaqDataPipeline.from_template(
+                name="asdf", description="qwerty", template_name="dynamodb_backup", **kwargs)
+
     def test__description_only_object__content_and_persisted_false(self):
         "AsiaqDataPipeline construction with only required args"
         pipeline = AsiaqDataPipeline(name="asdf", description="qwerty")
@@ -26,7 +59,7 @@ class DataPipelineTest(TestCase):
 
     def test__get_tag_dict__no_tags__no_return(self):
         "AsiaqDataPipeline.get_tag_dict with no tags"
-        pipeline = AsiaqDataPipeline(name="asdf", description="qwerty")
+        pipeline = copy.copy(self._PROTOTYPE)
         self.assertIsNone(pipeline.get_tag_dict())
 
     def test__get_tag_dict__tags_dict_passed__correct_return(self):
@@ -55,65 +88,43 @@ class DataPipelineTest(TestCase):
             tags=[{'key': 'template', 'stringValue': 'conflict'}])
         self.assertRaises(asiaq_exceptions.DataPipelineFormatException, pipeline.get_tag_dict)
 
-    def test__last_run__no_metadata__state_exception(self):
-        "AsiaqDataPipeline.last_run fails appropriately when no metadata is set"
-        pipeline = AsiaqDataPipeline("TEST", "TESTY")
-        with self.assertRaises(asiaq_exceptions.DataPipelineStateException):
-            _ = pipeline.last_run
-
-    def test__last_run__no_field__none_returned(self):
-        "AsiaqDataPipeline.last_run is None when metadata does not include last-run"
-        pipeline = AsiaqDataPipeline("TEST", "TESTY", metadata=[{'key': '@foo', 'stringValue': 'bar'}])
-        self.assertIsNone(pipeline.last_run)
-
-    def test__last_run__valid_date__datetime_returned(self):
-        "AsiaqDataPipeline.last_run is a correct datetime"
-        pipeline = AsiaqDataPipeline("TEST", "TESTY", metadata=[
-            {'key': '@latestRunTime', 'stringValue': '1978-08-05T08:00:00'}])
-        self.assertEqual(1978, pipeline.last_run.year)
-        self.assertEqual(8, pipeline.last_run.month)
-        self.assertEqual(5, pipeline.last_run.day)
-        self.assertEqual(8, pipeline.last_run.hour)
-        self.assertEqual(0, pipeline.last_run.utcoffset().total_seconds())
-
-    def test__health__no_field__none_returned(self):
-        "AsiaqDataPipeline.health is none if the field is absent"
-        pipeline = AsiaqDataPipeline("TEST", "TESTY", metadata=[{'key': '@foo', 'stringValue': 'bar'}])
-        self.assertIsNone(pipeline.health)
-
-    def test__health__field_set__value_found(self):
-        "AsiaqDataPipeline.health is found if set"
-        pipeline = AsiaqDataPipeline("TEST", "TESTY", metadata=[
-            {'key': '@healthStatus', 'stringValue': 'SUPERHEALTHY'}])
-        self.assertEqual('SUPERHEALTHY', pipeline.health)
-
-    def test__pipeline_state__field_absent__exception(self):
-        "AsiaqDataPipeline.pipeline_state causes an exception if not set"
-        pipeline = AsiaqDataPipeline("TEST", "TESTY", metadata=[{'key': '@foo', 'stringValue': 'bar'}])
-        with self.assertRaises(KeyError):
-            _ = pipeline.pipeline_state
-
-    def test__pipeline_state__field_set__value_found(self):
-        "AsiaqDataPipeline.pipeline_state is found if set"
-        pipeline = AsiaqDataPipeline("TEST", "TESTY", metadata=[
-            {'key': '@pipelineState', 'stringValue': 'NIFTY'}])
-        self.assertEqual('NIFTY', pipeline.pipeline_state)
-
-    def test__create_date__field_absent__exception(self):
-        "AsiaqDataPipeline.create_date causes an exception if not set"
-        pipeline = AsiaqDataPipeline("TEST", "TESTY", metadata=[{'key': '@foo', 'stringValue': 'bar'}])
-        with self.assertRaises(KeyError):
-            _ = pipeline.create_date
-
-    def test__create_date__field_set__datetime_found(self):
-        "AsiaqDataPipeline.create_date is a correct datetime"
-        pipeline = AsiaqDataPipeline("TEST", "TESTY", metadata=[
-            {'key': '@creationTime', 'stringValue': '2008-01-20T17:00:00'}])
-        self.assertEqual(2008, pipeline.create_date.year)
-        self.assertEqual(1, pipeline.create_date.month)
-        self.assertEqual(20, pipeline.create_date.day)
-        self.assertEqual(17, pipeline.create_date.hour)
-        self.assertEqual(0, pipeline.create_date.utcoffset().total_seconds())
+    def test__metadata_properties__table__expected_values(self):
+        "AsiaqDataPipeline metadata properties return values, None or errors as appropriate"
+        other_field = [{'key': '@foo', 'stringValue': 'bar'}]
+        cases = [
+            # (case name, property, metadata, expected value, expected exception)
+            ("last_run with no metadata", 'last_run', None,
+             None, asiaq_exceptions.DataPipelineStateException),
+            ("last_run with field absent", 'last_run', other_field, None, None),
+            ("last_run with valid date", 'last_run',
+             [{'key': '@latestRunTime', 'stringValue': '1978-08-05T08:00:00'}],
+             datetime(1978, 8, 5, 8, tzinfo=utc), None),
+            ("health with field absent", 'health', other_field, None, None),
+            ("health with field set", 'health',
+             [{'key': '@healthStatus', 'stringValue': 'SUPERHEALTHY'}], 'SUPERHEALTHY', None),
+            ("pipeline_state with field absent", 'pipeline_state', other_field, None, KeyError),
+            ("pipeline_state with field set", 'pipeline_state',
+             [{'key': '@pipelineState', 'stringValue': 'NIFTY'}], 'NIFTY', None),
+            ("create_date with field absent", 'create_date', other_field, None, KeyError),
+            ("create_date with valid date", 'create_date',
+             [{'key': '@creationTime', 'stringValue': '2008-01-20T17:00:00'}],
+             datetime(2008, 1, 20, 17, tzinfo=utc), None),
+        ]
+        for case_name, prop, metadata, expected, expected_exception in cases:
+            pipeline = AsiaqDataPipeline("TEST", "TESTY", metadata=metadata)
+            if expected_exception:
+                # assertRaises takes no message on Python 2.7, so name the failing case by hand
+                try:
+                    getattr(pipeline, prop)
+                except expected_exception:
+                    continue
+                except Exception as err:  # pylint: disable=broad-except
+                    self.fail("%s: expected %s, got %r" % (case_name, expected_exception.__name__, err))
+                self.fail("%s: %s not raised" % (case_name, expected_exception.__name__))
+            found = getattr(pipeline, prop)
+            self.assertEqual(expected, found, msg=case_name)
+            if isinstance(expected, datetime):
+                self.assertEqual(0, found.utcoffset().total_seconds(), msg=case_name)
 
     def test__get_param_value_dict__duplicate_value__exception(self):
         "AsiaqDataPipeline.get_param_value_dict with a duplicate value definition"
@@ -125,53 +136,37 @@ class DataPipelineTest(TestCase):
 
     def test__from_template__template_missing__exception(self):
         "AsiaqDataPipeline.from_template with an invalid template"
-        self.assertRaises(asiaq_exceptions.AsiaqConfigError, AsiaqDataPipeline.from_template,
-                          name="asdf", description="qwerty", template_name="nope")
+        with self.assertRaises(asiaq_exceptions.AsiaqConfigError):
+            AsiaqDataPipeline.from_template(name="asdf", description="qwerty", template_name="nope")
 
     def test__from_template__template_ok__reasonable(self):
-        "AsiaqDataPipeline.from_template with a valid template"
-        pipeline = AsiaqDataPipeline.from_template(
-            name="asdf", description="qwerty", template_name="dynamodb_backup")
+        "AsiaqDataPipeline.from_template with a valid template, including the myDDBSchedulePeriod value"
+        pipeline = self._from_cached_template()
         self.assertFalse(pipeline._tags)
         self.assertFalse(pipeline.is_persisted())
         self.assertTrue(pipeline.has_content())
         # nasty cherry-pick:
         self.assertEqual("SchedulePeriod", pipeline._objects[0]['id'])
+        self.assertEqual("#{myDDBSchedulePeriod}", pipeline._objects[0]['fields'][0]['stringValue'])
         self.assertEqual(pipeline._name, "asdf")
         self.assertEqual(pipeline._description, "qwerty")
 
-    def test__from_template__backup_period_value(self):
-        "AsiaqDataPipeline.from_template test if from_template contains myDDBSchedulePeriod."
-        expected_period_value = "#{myDDBSchedulePeriod}"
-        pipeline = AsiaqDataPipeline.from_template(
-            name="asdf", description="qwerty", template_name="dynamodb_backup")
-        actual_pipeline_schedule = pipeline._objects[0]
-        actual_schedule_fields = actual_pipeline_schedule['fields']
-        self.assertEqual(expected_period_value, actual_schedule_fields[0]['stringValue'])
-
     def test__from_template__log_and_subnet_fields__fields_set(self):
         "AsiaqDataPipeline.from_template with a log location and subnet ID"
-        pipeline = AsiaqDataPipeline.from_template(
-            name="asdf", description="qwerty", template_name="dynamodb_backup",
-            log_location="FAKEY", subnet_id="McFAKEFAKE")
+        pipeline = self._from_cached_template(log_location="FAKEY", subnet_id="McFAKEFAKE")
         self.assertFalse(pipeline._tags)
         self.assertFalse(pipeline.is_persisted())
         self.assertTrue(pipeline.has_content())
-
-        def _find_default(objects):
-            for obj in objects:
-                if obj['id'] == 'Default':
-                    return obj
-
-        default_object = _find_default(pipeline._objects)
+        objects_by_id = {obj['id']: obj for obj in pipeline._objects}
+        default_object = objects_by_id['Default']
         self.assertIn({'key': 'pipelineLogUri', 'stringValue': 'FAKEY'}, default_object['fields'])
         self.assertIn({'key': 'subnetId', 'stringValue': 'McFAKEFAKE'}, default_object['fields'])
 
     def test__update_content__no_values__content_updated(self):
         "AsiaqDataPipeline.update_content with no parameter values"
-        pipeline = AsiaqDataPipeline(name="asdf", description="qwerty")
-        pipeline_objects = Mock()
-        param_defs = Mock()
+        pipeline = copy.copy(self._PROTOTYPE)
+        pipeline_objects = object()
+        param_defs = object()
         pipeline.update_content(pipeline_objects, param_defs)
         self.assertIs(pipeline._objects, pipeline_objects)
         self.assertIs(pipeline._params, param_defs)
@@ -182,8 +177,8 @@ class DataPipelineTest(TestCase):
         orig_values = {'this': 'will', 'be': 'overwritten'}
         pipeline = AsiaqDataPipeline(name="asdf", description="qwerty", param_values=orig_values)
         new_values = {'foo': 'bar', 'baz': '1'}
-        pipeline_objects = Mock()
-        param_defs = Mock()
+        pipeline_objects = object()
+        param_defs = object()
         pipeline.update_content(pipeline_objects, param_defs, new_values)
         self.assertEqual([{'id': 'foo', 'stringValue': 'bar'}, {'id': 'baz', 'stringValue': '1'}],
                          pipeline._param_values)
@@ -192,8 +187,8 @@ class DataPipelineTest(TestCase):
         "AsiaqDataPipeline.update_content does not overwrite parameter values when not appropriate"
         orig_values = {'this': 'will not', 'be': 'overwritten'}
         pipeline = AsiaqDataPipeline(name="asdf", description="qwerty", param_values=orig_values)
-        pipeline_objects = Mock()
-        param_defs = Mock()
+        pipeline_objects = object()
+        param_defs = object()
         pipeline.update_content(pipeline_objects, param_defs)
         self.assertEqual(
             [{'id': 'this', 'stringValue': 'will not'}, {'id': 'be', 'stringValue': 'overwritten'}],
@@ -204,8 +199,8 @@ class DataPipelineTest(TestCase):
         "AsiaqDataPipeline.update_content does not overwrite parameter values when not appropriate"
         orig_values = {'this': 'will', 'be': 'overwritten'}
         pipeline = AsiaqDataPipeline(name="asdf", description="qwerty", param_values=orig_values)
-        pipeline_objects = Mock()
-        param_defs = Mock()
+        pipeline_objects = object()
+        param_defs = object()
         pipeline.update_content(pipeline_objects, param_defs, [])
         self.assertEqual(
             [],
@@ -214,9 +209,9 @@ class DataPipelineTest(TestCase):
 
     def test__update_content__dict_values__content_updated(self):
         "AsiaqDataPipeline.update_content with silly dictionary parameter values"
-        pipeline = AsiaqDataPipeline(name="asdf", description="qwerty")
-        pipeline_objects = Mock()
-        param_defs = Mock()
+        pipeline = copy.copy(self._PROTOTYPE)
+        pipeline_objects = object()
+        param_defs = object()
         param_values = {'foo': 'bar', 'baz': '1'}
         pipeline.update_content(pipeline_objects, param_defs, param_values)
         self.assertIs(pipeline._objects, pipeline_objects)
@@ -229,9 +224,9 @@ class DataPipelineTest(TestCase):
 
     def test__update_content__list_values__content_updated(self):
         "AsiaqDataPipeline.update_content with silly listed parameter values"
-        pipeline = AsiaqDataPipeline(name="asdf", description="qwerty")
-        pipeline_objects = Mock()
-        param_defs = Mock()
+        pipeline = copy.copy(self._PROTOTYPE)
+        pipeline_objects = object()
+        param_defs = object()
         param_values = [
             {'id': 'foo', 'stringValue': 'bar'},
             {'id': 'bar', 'stringValue': 'baz'},
@@ -245,14 +240,14 @@ class DataPipelineTest(TestCase):
 
     def test__update_content__template__content_updated(self):
         "AsiaqDataPipeline.update_content with a template"
-        pipeline = AsiaqDataPipeline(name="asdf", description="qwerty")
+        pipeline = copy.copy(self._PROTOTYPE)
         pipeline.update_content(template_name="dynamodb_restore")
         self.assertTrue(pipeline.has_content())
         self.assertEqual("DDBDestinationTable", pipeline._objects[1]['id'])
 
     def test__update_content__log_location_and_subnet__fields_set(self):
         "AsiaqDataPipeline.update_content with log location and subnet ID"
-        pipeline = AsiaqDataPipeline(name="asdf", description="qwerty")
+        pipeline = copy.copy(self._PROTOTYPE)
         new_contents = [
             {'id': 'Default', 'fields': [{'key': 'uninteresting', 'stringValue': 'thing'}], 'name': 'short'},
             {'id': 'Other', 'fields': [], 'name': 'unused'}
@@ -264,15 +259,18 @@ class DataPipelineTest(TestCase):
     def test__update_content__bad_args__error(self):
         "AsiaqDataPipeline.update_content with bad argument combinations fails"
         pipeline = AsiaqDataPipeline(name="asdf", description="qwerty")
-        self.assertRaises(asiaq_exceptions.ProgrammerError, pipeline.update_content)
-        self.assertRaises(asiaq_exceptions.ProgrammerError, pipeline.update_content,
-                          template_name="something", contents="something else")
+        with self.assertRaises(asiaq_exceptions.ProgrammerError):
+            pipeline.update_content()
+        with self.assertRaises(asiaq_exceptions.ProgrammerError):
+            pipeline.update_content(template_name="something", contents="something else")
 
 
 class DataPipelineManagerTest(TestCase):
     "Tests for the pipeline management wrapper."
 
     # pylint: disable=invalid-name
+    # Class fixtures are re-entrant; see DataPipelineTest.
+    _multiprocess_can_split_ = True
     SEARCH_DESCRIPTIONS = [
         {'name': 'pipeline1', 'description': 'pipeline with no tags', 'pipelineId': 'p1'},
         {'name': 'nodescpipeline', 'pipelineId': 'nodesc',
@@ -285,21 +283,33 @@ class DataPipelineManagerTest(TestCase):
 
     def _persisted_pipeline(self, contents=None):
         "Return a pipeline with a set AWS ID, so that it apppears to be 'saved' to AWS already."
-        return AsiaqDataPipeline("test", "pipeline with id", pipeline_id="asdf", contents=contents)
+        pipeline = copy.copy(self._PERSISTED)
+        pipeline._objects = contents
+        return pipeline
 
     def _unpersisted_pipeline(self, contents=None):
         "Return a pipeline with no AWS ID."
-        return AsiaqDataPipeline("test", "pipeline with no id", contents=contents)
-
-    def setUp(self):
-        self.mock_client = MagicMock(spec=boto3.client("datapipeline"))
-        self.mock_client.list_pipelines.return_value = {
+        pipeline = copy.copy(self._UNPERSISTED)
+        pipeline._objects = contents
+        return pipeline
+
+    @classmethod
+    def setUpClass(cls):
+        # Canned client responses are never modified by the code under test, so they are shared
+        cls._LIST_RESPONSE = {
             'hasMoreResults': False,
             'pipelineIdList': [{'id': item} for item in ['abcd', 'qwerty', '12345']]
         }
-        self.mock_client.describe_pipelines.return_value = {
-            'pipelineDescriptionList': self.SEARCH_DESCRIPTIONS
+        cls._DESCRIBE_RESPONSE = {
+            'pipelineDescriptionList': cls.SEARCH_DESCRIPTIONS
         }
+        cls._PERSISTED = AsiaqDataPipeline("test", "pipeline with id", pipeline_id="asdf")
+        cls._UNPERSISTED = AsiaqDataPipeline("test", "pipeline with no id")
+
+    def setUp(self):
+        self.mock_client = MagicMock(spec_set=_DP_METHODS)
+        self.mock_client.list_pipelines.return_value = self._LIST_RESPONSE
+        self.mock_client.describe_pipelines.return_value = self._DESCRIBE_RESPONSE
         self.mgr = AsiaqDataPipelineManager(self.mock_client)
 
     def test__construction__client_created(self):
@@ -307,70 +317,55 @@ class DataPipelineManagerTest(TestCase):
         manager = AsiaqDataPipelineManager()
         self.assertIsNotNone(manager._dp_client)
 
-    def test__fetch__no_params_object__ok(self):
-        "AsiaqDataPipelineManager.fetch behaves as expected for param-less pipeline"
-        objects = Mock()
-        self.mock_client.get_pipeline_definition.return_value = {'pipelineObjects': objects}
-        fetched = self.mgr.fetch("ab-cdef")
-        self.assertEqual(objects, fetched._objects)
-        self.assertIsNone(fetched._param_values)
-        self.assertIsNone(fetched._params)
-        self.mock_client.get_pipeline_definition.assert_called_once_with(pipelineId="ab-cdef",
-                                                                         version="latest")
-        self.mock_client.describe_pipelines.assert_called_once_with(pipelineIds=['ab-cdef'])
-
     def test__fetch__full_content_object__ok(self):
         "AsiaqDataPipelineManager.fetch behaves as expected for fully-defined pipeline"
-        objects = Mock()
-        params = Mock()
-        values = Mock()
+        objects = object()
+        params = object()
+        values = object()
         self.mock_client.get_pipeline_definition.return_value = {
             'pipelineObjects': objects, 'parameterObjects': params, 'parameterValues': values}
         fetched = self.mgr.fetch("ab-cdef")
-        self.assertEqual(objects, fetched._objects)
-        self.assertEqual(values, fetched._param_values)
-        self.assertEqual(params, fetched._params)
+        self.assertIs(objects, fetched._objects)
+        self.assertIs(values, fetched._param_values)
+        self.assertIs(params, fetched._params)
         self.mock_client.get_pipeline_definition.assert_called_once_with(pipelineId="ab-cdef",
                                                                          version="latest")
         self.mock_client.describe_pipelines.assert_called_once_with(pipelineIds=['ab-cdef'])
 
     def test__fetch_content__already_fetched_error(self):
         "AsiaqDataPipelineManager.fetch_content on an already-populated object: error"
-        pipeline = self._persisted_pipeline(contents=Mock())
-        self.assertRaises(asiaq_exceptions.DataPipelineStateException, self.mgr.fetch_content, pipeline)
+        pipeline = self._persisted_pipeline(contents=sentinel.contents)
+        with self.assertRaises(asiaq_exceptions.DataPipelineStateException):
+            self.mgr.fetch_content(pipeline)
 
     def test__fetch_content__not_saved_error(self):
         "AsiaqDataPipelineManager.fetch_content on a detached object: error"
         pipeline = self._unpersisted_pipeline()
-        self.assertRaises(asiaq_exceptions.DataPipelineStateException, self.mgr.fetch_content, pipeline)
+        with self.assertRaises(asiaq_exceptions.DataPipelineStateException):
+            self.mgr.fetch_content(pipeline)
 
     def test__fetch_content__common_case__ok(self):
         "AsiaqDataPipelineManager.fetch_content in a 'normal' case behaves normally"
         pipeline = self._persisted_pipeline()
-        objects = Mock()
-        params = Mock()
-        values = Mock()
+        objects = object()
+        params = object()
+        values = object()
         self.mock_client.get_pipeline_definition.return_value = {
             'pipelineObjects': objects, 'parameterObjects': params, 'parameterValues': values}
         self.mgr.fetch_content(pipeline)
         self.mock_client.get_pipeline_definition.assert_called_once_with(pipelineId="asdf", version="latest")
-        self.assertEqual(objects, pipeline._objects)
-        self.assertEqual(values, pipeline._param_values)
-        self.assertEqual(params, pipeline._params)
+        self.assertIs(objects, pipeline._objects)
+        self.assertIs(values, pipeline._param_values)
+        self.assertIs(params, pipeline._params)
 
     def test__delete__unsaved__error(self):
         "AsiaqDataPipelineManager.delete on a detached object: error"
         pipeline = self._unpersisted_pipeline()
-        self.assertRaises(asiaq_exceptions.DataPipelineStateException, self.mgr.delete, pipeline)
-
-    def test__delete__common_case__ok(self):
-        "AsiaqDataPipelineManager.delete on a saved object: deletes"
-        pipeline = self._persisted_pipeline()
-        self.mgr.delete(pipeline)
-        self.mock_client.delete_pipeline.assert_called_once_with(pipelineId='asdf')
+        with self.assertRaises(asiaq_exceptions.DataPipelineStateException):
+            self.mgr.delete(pipeline)
 
     def test__save__update_pipeline__only_content_updated(self):
-        "AsiaqDataPipelineManager.save on a persisted object: update only"
+        "AsiaqDataPipelineManager.save on a persisted object: update only, with empty parameters"
         contents = Mock()
         pipeline = self._persisted_pipeline(contents)
         self.mgr.save(pipeline)
@@ -379,18 +374,16 @@ class DataPipelineManagerTest(TestCase):
             pipelineId="asdf", pipelineObjects=contents, parameterObjects=[], parameterValues=[])
 
     def test__save__new_pipeline__meta_and_content_updated(self):
-        "AsiaqDataPipelineManager.save on a detached object: create and save content"
+        "AsiaqDataPipelineManager.save on a detached object: create and save content, with empty parameters"
         self.mock_client.create_pipeline.return_value = {'pipelineId': 'qwerty'}
         contents = Mock()
         pipeline = self._unpersisted_pipeline(contents)
         self.mgr.save(pipeline)
         self.assertEqual(pipeline._id, 'qwerty')
-        self.assertEqual(self.mock_client.create_pipeline.call_count, 1)  # args are too much of a pain
+        self.mock_client.create_pipeline.assert_called_once_with(
+            name='test', uniqueId=ANY, description='pipeline with no id', tags=[])
         self.mock_client.put_pipeline_definition.assert_called_once_with(
             pipelineId="qwerty", pipelineObjects=contents, parameterObjects=[], parameterValues=[])
-        self.assertEqual('test', self.mock_client.create_pipeline.call_args[1]['name'])
-        self.assertEqual('pipeline with no id', self.mock_client.create_pipeline.call_args[1]['description'])
-        self.assertEqual([], self.mock_client.create_pipeline.call_args[1]['tags'])
 
     def test__search_descriptions__no_ids__no_results(self):
         "AsiaqDataPipelineManager.search_descriptions with empty results"
@@ -403,58 +396,41 @@ class DataPipelineManagerTest(TestCase):
     def test__search_descriptions__search_all__all_found(self):
         "AsiaqDataPipelineManager.search_descriptions without filtering"
         searched = self.mgr.search_descriptions()
-        self.assertEqual(4, len(searched))
-        for i in range(4):
-            self.assertEqual(searched[i]._name, self.SEARCH_DESCRIPTIONS[i]['name'])
-            self.assertEqual(searched[i]._id, self.SEARCH_DESCRIPTIONS[i]['pipelineId'])
+        self.assertListEqual([(desc['name'], desc['pipelineId']) for desc in self.SEARCH_DESCRIPTIONS],
+                             [(pipeline._name, pipeline._id) for pipeline in searched])
 
         # hand-assert special cases
         self.assertIsNone(searched[0]._tags, msg="Missing tags handled correctly")
         self.assertIsNone(searched[1]._description, msg="Missing description handled correctly")
-        self.assertEqual({'environment': 'build', 'extraneous': 'tag'}, searched[2].get_tag_dict())
-
-    def test__search_descriptions__by_bad_name__nothing_found(self):
-        "AsiaqDataPipelineManager.search_descriptions filtering for a non-existent pipeline name"
-        self.assertEqual([], self.mgr.search_descriptions(name="asdfasdfasdfasd"))
-
-    def test__search_descriptions__by_good_name__pipeline_found(self):
-        "AsiaqDataPipelineManager.search_descriptions filtering for a unique pipeline name"
-        searched = self.mgr.search_descriptions(name="nodescpipeline")
-        self.assertEqual(1, len(searched))
-        self.assertEqual("nodescpipeline", searched[0]._name)
-        self.assertIsNone(searched[0]._description)
-
-    def test__search_descriptions__by_dupe_name__pipelines_found(self):
-        "AsiaqDataPipelineManager.search_descriptions filtering for a repeated pipeline name"
-        searched = self.mgr.search_descriptions(name="mypipeline")
-        self.assertEqual(2, len(searched))
-        self.assertEqual("mypipeline", searched[0]._name)
-        self.assertEqual("buildit", searched[0]._id)
-        self.assertEqual("ciya", searched[1]._id)
-
-    def test__search_descriptions__by_bad_tag__nothing_found(self):
-        "AsiaqDataPipelineManager.search_descriptions filtering for a non-existent tag"
-        searched = self.mgr.search_descriptions(tags={'foo': 'bar'})
-        self.assertEqual([], searched)
-
-    def test__search_descriptions__by_good_tag__pipeline_found(self):
-        "AsiaqDataPipelineManager.search_descriptions filtering for a unique tag"
-        searched = self.mgr.search_descriptions(tags={'environment': 'ci'})
-        self.assertEqual(1, len(searched))
-        self.assertEqual("mypipeline", searched[0]._name)
-        self.assertEqual("pipeline in ci", searched[0]._description)
-
-    def test__search_descriptions__by_dupe_name_and_tag__pipelines_found(self):
-        "AsiaqDataPipelineManager.search_descriptions filtering for a tag/name combination"
-        searched = self.mgr.search_descriptions(name="mypipeline", tags={'environment': 'build'})
-        self.assertEqual(1, len(searched))
-        self.assertEqual("mypipeline", searched[0]._name)
-        self.assertEqual("buildit", searched[0]._id)
+        self.assertDictEqual({'environment': 'build', 'extraneous': 'tag'}, searched[2].get_tag_dict())
+
+    def test__search_descriptions__repeated_search__fresh_pipelines(self):
+        "AsiaqDataPipelineManager.search_descriptions does not hand back pipelines from earlier searches"
+        first = self.mgr.search_descriptions()
+        first[0].update_content(contents=[{'id': 'Default', 'fields': []}])
+        second = self.mgr.search_descriptions()
+        self.assertIsNot(first[0], second[0])
+        self.assertFalse(second[0].has_content())
+
+    def test__search_descriptions__filters__matching_pipelines_found(self):
+        "AsiaqDataPipelineManager.search_descriptions filtering by name and/or tags"
+        cases = [
+            ({'name': "asdfasdfasdfasd"}, []),
+            ({'name': "nodescpipeline"}, ['nodesc']),
+            ({'name': "mypipeline"}, ['buildit', 'ciya']),
+            ({'tags': {'foo': 'bar'}}, []),
+            ({'tags': {'environment': 'ci'}}, ['ciya']),
+            ({'name': "mypipeline", 'tags': {'environment': 'build'}}, ['buildit']),
+        ]
+        for search_filter, expected_ids in cases:
+            searched = self.mgr.search_descriptions(**search_filter)
+            self.assertListEqual(expected_ids, [pipeline._id for pipeline in searched],
+                                 msg=str(search_filter))
 
     def test__start__unpersisted__error(self):
         "AsiaqDataPipelineManager.start on a detached object: error"
-        self.assertRaises(asiaq_exceptions.DataPipelineStateException,
-                          self.mgr.start, self._unpersisted_pipeline())
+        with self.assertRaises(asiaq_exceptions.DataPipelineStateException):
+            self.mgr.start(self._unpersisted_pipeline())
 
     def test__start__persisted_without_params__started(self):
         "AsiaqDataPipelineManager.start with no parameter values anywhere"
@@ -468,19 +444,19 @@ class DataPipelineManagerTest(TestCase):
     def test__start__persisted_with_param_values__started_with_param_values(self):
         "AsiaqDataPipelineManager.start with parameter values in the object"
         pipeline = self._persisted_pipeline()
-        pipeline._param_values = Mock()
+        pipeline._param_values = sentinel.param_values
         self.mgr.start(pipeline)
         self.assertEqual(1, self.mock_client.activate_pipeline.call_count)
         activate_args = self.mock_client.activate_pipeline.call_args[1]
         self.assertEqual("asdf", activate_args['pipelineId'])
-        self.assertEqual(pipeline._param_values, activate_args['parameterValues'])
+        self.assertIs(sentinel.param_values, activate_args['parameterValues'])
         self.assertIn('startTimestamp', activate_args)
 
     def test__start__param_values_list__started_with_correct_param_values(self):
         "AsiaqDataPipelineManager.start with parameter values as a list and in the object"
         pipeline = self._persisted_pipeline()
-        pipeline._param_values = Mock()  # this is the WRONG set of params
-        real_params = [Mock(), Mock()]
+        pipeline._param_values = sentinel.wrong_param_values
+        real_params = [sentinel.param1, sentinel.param2]
         self.mgr.start(pipeline, params=real_params)
         self.assertEqual(1, self.mock_client.activate_pipeline.call_count)
         activate_args = self.mock_client.activate_pipeline.call_args[1]
@@ -491,7 +467,7 @@ class DataPipelineManagerTest(TestCase):
     def test__start__param_values_dict__started_with_correct_param_values(self):
         "AsiaqDataPipelineManager.start with parameter values as a dict and in the object"
         pipeline = self._persisted_pipeline()
-        pipeline._param_values = Mock()  # this is the WRONG set of params
+        pipeline._param_values = sentinel.wrong_param_values
         real_params = {"foo": "bar", "qwerty": "asdf"}
         self.mgr.start(pipeline, params=real_params)
         self.assertEqual(1, self.mock_client.activate_pipeline.call_count)
@@ -504,25 +480,25 @@ class DataPipelineManagerTest(TestCase):
     @patch('disco_aws_automation.disco_datapipeline.datetime')
     def test__start__no_time_given__utcnow_called(self, datetime):
         "AsiaqDataPipelineManager.start with no start time uses utcnow"
-        fake_now = Mock()
+        fake_now = sentinel.now
         datetime.utcnow = Mock(return_value=fake_now)
         self.mgr.start(self._persisted_pipeline())
         self.assertEqual(1, self.mock_client.activate_pipeline.call_count)
         activate_args = self.mock_client.activate_pipeline.call_args[1]
-        self.assertEqual(fake_now, activate_args['startTimestamp'])
+        self.assertIs(fake_now, activate_args['startTimestamp'])
 
     def test__start__time_passed__time_used(self):
         "AsiaqDataPipelineManager.start with passed-in start time uses passed-in value"
-        start_time = Mock()
+        start_time = sentinel.start_time
         self.mgr.start(self._persisted_pipeline(), start_time=start_time)
         self.assertEqual(1, self.mock_client.activate_pipeline.call_count)
         activate_args = self.mock_client.activate_pipeline.call_args[1]
-        self.assertEqual(start_time, activate_args['startTimestamp'])
+        self.assertIs(start_time, activate_args['startTimestamp'])
 
     def test__stop__unpersisted__error(self):
         "AsiaqDataPipelineManager.stop with a detached object: error"
-        self.assertRaises(asiaq_exceptions.DataPipelineStateException,
-                          self.mgr.stop, self._unpersisted_pipeline())
+        with self.assertRaises(asiaq_exceptions.DataPipelineStateException):
+            self.mgr.stop(self._unpersisted_pipeline())
 
     def test__stop__persisted__stopped(self):
         "AsiaqDataPipelineManager.stop with a saved pipeline: stops"
@@ -530,6 +506,73 @@ class DataPipelineManagerTest(TestCase):
         self.mock_client.deactivate_pipeline.assert_called_once_with(pipelineId="asdf")
 
 
+class DataPipelineManagerMotoTest(TestCase):
+    """
+    Round-trip tests for the pipeline management wrapper, run against moto's in-memory datapipeline.
+    Moto does not implement deactivate_pipeline and does not store parameter objects or values, so
+    start/stop and the exact arguments save sends stay in DataPipelineManagerTest.
+    """
+    # pylint: disable=invalid-name
+    CONTENTS = [
+        {'id': 'Default', 'name': 'Default', 'fields': [{'key': 'scheduleType', 'stringValue': 'ondemand'}]}
+    ]
+    # Each test starts its own moto backend, so the shared client is safe in any worker.
+    _multiprocess_can_split_ = True
+
+    @classmethod
+    def setUpClass(cls):
+        # Building a client loads the botocore service model, so do it once; moto intercepts its
+        # requests whenever the mock is started, regardless of when the client was created.
+        # moto's datapipeline backend does not know about the region in our test AWS config.
+        cls._CLIENT = boto3.client("datapipeline", region_name="us-east-1")
+
+    def setUp(self):
+        datapipeline_mock = mock_datapipeline()
+        datapipeline_mock.start()
+        self.addCleanup(datapipeline_mock.stop)
+        self.mgr = AsiaqDataPipelineManager(self._CLIENT)
+
+    def test__save__new_pipeline__meta_and_content_saved(self):
+        "AsiaqDataPipelineManager.save on a detached object: create and save content"
+        pipeline = AsiaqDataPipeline("test", "pipeline with no id", tags={'environment': 'ci'},
+                                     contents=copy.deepcopy(self.CONTENTS))
+        self.mgr.save(pipeline)
+        self.assertTrue(pipeline.is_persisted())
+        fetched = self.mgr.fetch(pipeline._id)
+        self.assertEqual('test', fetched._name)
+        self.assertEqual('pipeline with no id', fetched._description)
+        self.assertEqual({'environment': 'ci'}, fetched.get_tag_dict())
+        self.assertEqual(self.CONTENTS, fetched._objects)
+
+    def test__save__persisted_pipeline__only_content_updated(self):
+        "AsiaqDataPipelineManager.save on a persisted object: update only"
+        pipeline = AsiaqDataPipeline("test", "pipeline to update", contents=copy.deepcopy(self.CONTENTS))
+        self.mgr.save(pipeline)
+        pipeline_id = pipeline._id
+        pipeline._objects[0]['fields'][0]['stringValue'] = 'cron'
+        self.mgr.save(pipeline)
+        self.assertEqual(pipeline_id, pipeline._id)
+        self.assertEqual([pipeline_id], [found._id for found in self.mgr.search_descriptions()])
+        self.assertEqual(pipeline._objects, self.mgr.fetch(pipeline_id)._objects)
+
+    def test__fetch__no_params_object__ok(self):
+        "AsiaqDataPipelineManager.fetch behaves as expected for param-less pipeline"
+        pipeline = AsiaqDataPipeline("test", "pipeline with no params", contents=copy.deepcopy(self.CONTENTS))
+        self.mgr.save(pipeline)
+        fetched = self.mgr.fetch(pipeline._id)
+        self.assertEqual(pipeline._id, fetched._id)
+        self.assertEqual(self.CONTENTS, fetched._objects)
+        self.assertIsNone(fetched._param_values)
+        self.assertIsNone(fetched._params)
+
+    def test__delete__common_case__ok(self):
+        "AsiaqDataPipelineManager.delete on a saved object: deletes"
+        pipeline = AsiaqDataPipeline("test", "pipeline to delete", contents=copy.deepcopy(self.CONTENTS))
+        self.mgr.save(pipeline)
+        self.mgr.delete(pipeline)
+        self.assertEqual([], self.mgr.search_descriptions())
+
+
 class PipelineUtilityTest(TestCase):
     "Unit tests for the utility functions in the data pipeline package."
     # pylint: disable=invalid-name
@@ -537,9 +580,12 @@ class PipelineUtilityTest(TestCase):
 
     def test__template_to_boto__missing_keys__key_error(self):
         "template_to_boto: missing top-level template keys fail."
-        self.assertRaises(KeyError, template_to_boto, {})
-        self.assertRaises(KeyError, template_to_boto, {'objects': []})
-        self.assertRaises(KeyError, template_to_boto, {'parameters': []})
+        with self.assertRaises(KeyError):
+            template_to_boto({})
+        with self.assertRaises(KeyError):
+            template_to_boto({'objects': []})
+        with self.assertRaises(KeyError):
+            template_to_boto({'parameters': []})
 
     def test__template_to_boto__empty_values__empty_return(self):
         "template_to_boto: degenerate input succeeds."
@@ -4,12 +4,14 @@ Tests of disco_bake
 from __future__ import print_function
 
 import random
+import re
+from operator import attrgetter
 from unittest import TestCase
 from datetime import datetime, timedelta
 
-import boto.ec2.instance
 import requests
 import requests_mock
+from parameterized import parameterized
 from mock import MagicMock, create_autospec, call, patch, ANY
 
 from disco_aws_automation import DiscoDeploy, DiscoAWS, DiscoGroup, DiscoBake, DiscoELB, DiscoSSM
@@ -26,7 +28,9 @@ from tests.helpers.patch_disco_aws import get_mock_config
 # Don't limit number of tests
 # pylint: disable=R0904
 
-MOCK_PIPELINE_DEFINITION = [
+# A tuple so the shared definition can't be reordered or extended; DiscoDeploy gets a copy of each
+# entry per test, since it hands these dicts out by reference.
+MOCK_PIPELINE_DEFINITION = (
     {
         'hostclass': 'mhcintegrated',
         'min_size': "1",
@@ -92,9 +96,33 @@ MOCK_PIPELINE_DEFINITION = [
         'integration_test': "ssm_service",
         'deployable': 'no'
     }
-]
+)
+
+# Raised by mocks that simulate a wait timing out; one instance serves every test
+_TIMEOUT = TimeoutError()
+
+# Seeded so generated AMI, instance and group ids are the same on every run
+_RNG = random.Random(0xA51A)
 
 SOCIFY_API_BASE = 'https://socify-ci.aws.wgen.net'
+# SOCIFY's validate and event responses
+_VALIDATE_PASSED = {
+    'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
+    'result': {'status': 'Passed', 'err_msgs': []}
+}
+_EVENT_OK = {
+    'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
+}
+_VALIDATE_FAILED = {
+    'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
+    'result': {'status': 'Failed', 'err_msgs': ["Some error message"]}
+}
+_EVENT_ERR = {
+    'errorMessage': 'SOCIFY failed executing the event request'
+}
+# The error DiscoDeploy raises when SOCIFY rejects or cannot validate a deploy
+_SOC_VALIDATION_FAILED = re.compile(r"The SOC validation of the associated Ticket and AMI failed\.")
+
 SSM_DOC_TESTING_MODE = "fake_ssm_doc_testing_mode"
 SSM_DOC_INTEGRATION_TESTS = "fake_ssm_doc_integration_tests"
 
@@ -125,69 +153,198 @@ MOCK_CONFIG_DEFINITON = {
 }
 
 
+# (name, stage, is_private) of the AMIs every test starts with
+_AMI_SPECS = (
+    ('mhcfoo 1', 'untested', False),
+    ('mhcbar 2', 'tested', False),
+    ('mhcbar 3', 'tested', True),
+    ('mhcfoo 4', 'tested', False),
+    ('mhcfoo 5', None, False),
+    ('mhcbar 1', 'tested', False),
+    ('mhcfoo 2', 'tested', False),
+    ('mhcfoo 3', 'tested', False),
+    ('mhcfoo 6', 'untested', False),
+    ('mhcnew 1', 'untested', False),
+    ('mhcfoo 7', 'failed', False),
+    ('mhcfoo 8', 'untested', True),
+    ('mhcfoo 9', None, True),
+    ('mhcfoo 10', 'tested', True),
+    ('mhcfoo 11', 'failed', True),
+    ('mhcintegrated 1', None, False),
+    ('mhcintegrated 2', 'tested', False),
+    ('mhcintegrated 3', None, False),
+    ('mhcbluegreen 1', 'tested', False),
+    ('mhcbluegreen 2', 'untested', False),
+    ('mhcbluegreennondeployable 1', 'tested', False),
+    ('mhcbluegreennondeployable 2', 'untested', False),
+    ('mhctimedautoscale 1', 'untested', False)
+)
+
+# Names of the fixture AMIs whose hostclass is in MOCK_PIPELINE_DEFINITION, in fixture order
+_PIPELINE_ORDER = (
+    "mhcfoo 1",
+    "mhcfoo 4",
+    "mhcfoo 5",
+    "mhcfoo 2",
+    "mhcfoo 3",
+    "mhcfoo 6",
+    "mhcfoo 7",
+    "mhcfoo 8",
+    "mhcfoo 9",
+    "mhcfoo 10",
+    "mhcfoo 11",
+    "mhcintegrated 1",
+    "mhcintegrated 2",
+    "mhcintegrated 3",
+    "mhcbluegreen 1",
+    "mhcbluegreen 2",
+    "mhcbluegreennondeployable 1",
+    "mhcbluegreennondeployable 2",
+    "mhctimedautoscale 1"
+)
+
+
+# The pipeline config DiscoDeploy passes to spinup for an mhcbluegreen AMI, less its sizing
+_BG_SPINUP_BASE = {
+    'ami': 'ami-12345678',
+    'sequence': 1,
+    'deployable': 'yes',
+    'integration_test': 'blue_green_service',
+    'smoke_test': 'no',
+    'hostclass': 'mhcbluegreen'
+}
+
+
+def _spinup_config(**overrides):
+    '''Returns the expected spinup pipeline config, _BG_SPINUP_BASE with any overrides applied'''
+    return dict(_BG_SPINUP_BASE, **overrides)
+
+
+# Most blue/green tests copy the size of _OLD_BG_GROUP, so their first spinup is always this testing call
+_BG_OLD_GROUP_CONFIG = _spinup_config(min_size=2, desired_size=3, max_size=4)
+_BG_OLD_GROUP_TESTING_CALL = call([_BG_OLD_GROUP_CONFIG], testing=True, create_if_exists=True)
+
+
+class _Namespace(object):
+    '''Plain attribute bag standing in for the boto AMIs, instances and groups the code under test reads'''
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _fake_ami(name="mhcbluegreen 2", ami_id="ami-12345678"):
+    '''Returns an AMI with just the name, id and tags that deploying and promoting it read'''
+    return _Namespace(name=name, id=ami_id, tags={})
+
+
+def _instance_dict(inst):
+    '''Returns the DiscoGroup.get_instances entry for inst, holding only the key deploys read from it'''
+    return {'instance_id': inst.instance_id}
+
+
 # Too many tests is probably not a bad thing
 # pylint: disable=too-many-lines
-class DiscoDeployTests(TestCase):
-    '''Test DiscoDeploy class'''
+class DiscoDeployTestBase(TestCase):
+    '''Fixtures and helpers shared by the DiscoDeploy test classes'''
+
+    # setUp is cheap and setUpClass only builds read-only fixtures, so a parallel nose run may
+    # hand individual tests of these classes to different processes.
+    _multiprocess_can_split_ = True
 
-    # This tells a parallel nose run to share this class's fixtures rather than run setUp in each process.
-    # Useful for when lengthy setUp runs can cause a parallel nose run to time out.
-    _multiprocess_shared_ = True
+    _environment_name = "foo"
 
-    def mock_ami(self, name, stage=None, state=u'available', is_private=False):
+    @staticmethod
+    def mock_ami(name, stage=None, state=u'available', is_private=False):
         '''Create a mock AMI'''
-        ami = create_autospec(boto.ec2.image.Image)
-        ami.name = name
-        ami.tags = {"stage": stage, "is_private": str(is_private)}
-        # ami.tags.get = MagicMock(return_value=stage)
-        ami.id = 'ami-' + ''.join(random.choice("0123456789abcdef") for _ in range(8))
-        ami.state = state
+        ami = _Namespace(
+            name=name,
+            tags={"stage": stage, "is_private": str(is_private)},
+            id='ami-%08x' % _RNG.getrandbits(32),
+            state=state
+        )
+        # Parsed once here rather than every time the code under test sorts AMIs by age
+        ami.creation_time = DiscoBake.extract_ami_creation_time_from_ami_name(ami)
+        ami.hostclass = DiscoBake.ami_hostclass(ami)
         return ami
 
-    def mock_instance(self):
+    @staticmethod
+    def mock_instance():
         '''Create a mock Instance'''
-        inst = create_autospec(boto.ec2.instance.Instance)
-        inst.id = 'i-' + ''.join(random.choice("0123456789abcdef") for _ in range(8))
-        inst.instance_id = inst.id
-        inst.image_id = 'ami-' + ''.join(random.choice("0123456789abcdef") for _ in range(8))
-        inst.tags = {"hostclass": "hostclass_being_tested"}
-        return inst
-
-    def mock_group(self, hostclass, min_size=None, max_size=None, desired_size=None, instances=None):
+        instance_id = 'i-%08x' % _RNG.getrandbits(32)
+        return _Namespace(
+            id=instance_id,
+            instance_id=instance_id,
+            image_id='ami-%08x' % _RNG.getrandbits(32),
+            tags={"hostclass": "hostclass_being_tested"}
+        )
+
+    @classmethod
+    def mock_group(cls, hostclass, min_size=None, max_size=None, desired_size=None, instances=None):
         '''Creates a mock autoscaling group for hostclass'''
-        group_mock = MagicMock()
-        timestamp = ''.join(random.choice("0123456789") for _ in range(13))
-        group_mock.name = self._environment_name + '_' + hostclass + "_" + timestamp
-        group_mock.min_size = min_size or 1
-        group_mock.max_size = max_size or 1
-        group_mock.desired_capacity = desired_size or 1
-        group_mock.instances = instances or []
-        return group_mock
+        timestamp = '%013d' % _RNG.randrange(10 ** 13)
+        return _Namespace(
+            name=cls._environment_name + '_' + hostclass + "_" + timestamp,
+            min_size=min_size or 1,
+            max_size=max_size or 1,
+            desired_capacity=desired_size or 1,
+            instances=instances or []
+        )
 
     def add_ami(self, name, stage, state=u'available', is_private=False):
         '''Add one Instance AMI Mock to an AMI list'''
         ami = self.mock_ami(name, stage, state, is_private)
-        assert ami.name == name
-        assert ami.tags.get('stage') == stage
-        assert ami.tags.get('is_private') == str(is_private)
         self._amis.append(ami)
         self._amis_by_name[ami.name] = ami
         return ami
 
+    @classmethod
+    def setUpClass(cls):
+        # The AMI fixtures are never mutated by the tests, so build them once and give each test
+        # its own list and dict of the shared objects.
+        cls._TEMPLATE_AMIS = [cls.mock_ami(name, stage, is_private=is_private)
+                              for name, stage, is_private in _AMI_SPECS]
+        cls._TEMPLATE_AMIS_BY_NAME = {ami.name: ami for ami in cls._TEMPLATE_AMIS}
+        cls._PIPELINE_AMIS = [cls._TEMPLATE_AMIS_BY_NAME[name] for name in _PIPELINE_ORDER]
+        # The AMIs that many tests pick out by name
+        cls._AMI_MHCBAR_2 = cls._TEMPLATE_AMIS_BY_NAME['mhcbar 2']
+        cls._AMI_MHCBAR_3 = cls._TEMPLATE_AMIS_BY_NAME['mhcbar 3']
+        cls._AMI_MHCFOO_4 = cls._TEMPLATE_AMIS_BY_NAME['mhcfoo 4']
+        cls._AMI_MHCINTEGRATED_2 = cls._TEMPLATE_AMIS_BY_NAME['mhcintegrated 2']
+        cls._MOCK_CONFIG = get_mock_config(MOCK_CONFIG_DEFINITON)
+        # The blue/green tests only read these, so one set of group instances and one pre-sized old
+        # group serve them all.
+        cls._INSTANCES = [cls.mock_instance() for _ in range(3)]
+        cls._INSTANCE_DICTS = [_instance_dict(inst) for inst in cls._INSTANCES]
+        cls._INSTANCE_IDS = [inst.instance_id for inst in cls._INSTANCES]
+        cls._OLD_BG_GROUP = cls.mock_group("mhcbluegreen", min_size=2, max_size=4, desired_size=3)
+        # The launch-time tests only need launch times ordered around a fixed moment
+        cls._NOW = datetime.utcnow()
+
     def init_latest_running_amis(self):
         '''Create the mock result for DiscoDeploy.get_latest_running_amis'''
         amis = {
-            "mhcintegrated": self._amis_by_name['mhcintegrated 2'],
-            "mhcfoo": self._amis_by_name['mhcfoo 4'],
+            "mhcintegrated": self._AMI_MHCINTEGRATED_2,
+            "mhcfoo": self._AMI_MHCFOO_4,
             "mhcbluegreen": self._amis_by_name['mhcbluegreen 1'],
             "mhcbluegreennondeployable": self._amis_by_name['mhcbluegreennondeployable 1'],
-            "mhcbar": self._amis_by_name['mhcbar 3']
+            "mhcbar": self._AMI_MHCBAR_3
         }
         self._real_get_latest_running_amis = self._ci_deploy.get_latest_running_amis
-        self._ci_deploy.get_latest_running_amis = MagicMock(return_value=amis)
+        self.stub_latest_running_amis(amis)
+
+    def stub_latest_running_amis(self, amis):
+        '''Make DiscoDeploy.get_latest_running_amis return the given hostclass: ami mapping'''
+        # None of the tests assert on this call, so a plain function is enough
+        self._ci_deploy.get_latest_running_amis = lambda: amis
 
     def setUp(self):
-        self._environment_name = "foo"
+        # SOCIFY accepts validate and event requests unless a test registers another response, and
+        # any other HTTP request fails immediately instead of waiting on real DNS and connection timeouts.
+        self._requests = requests_mock.Mocker()
+        self._requests.start()
+        self.addCleanup(self._requests.stop)
+        self._requests.post(SOCIFY_API_BASE + "/validate", json=_VALIDATE_PASSED)
+        self._requests.post(SOCIFY_API_BASE + "/event", json=_EVENT_OK)
+
         self._disco_group = create_autospec(DiscoGroup, instance=True)
         self._disco_elb = create_autospec(DiscoELB, instance=True)
         self._disco_aws = create_autospec(DiscoAWS, instance=True)
@@ -196,48 +353,31 @@ class DiscoDeployTests(TestCase):
         self._test_aws = self._disco_aws
         self._existing_group = self.mock_group("mhcfoo")
         self._disco_group.get_existing_group.return_value = self._existing_group.__dict__
-        self._disco_bake = MagicMock()
-        self._disco_bake.promote_ami = MagicMock()
-        self._disco_bake.ami_stages = MagicMock(return_value=['untested', 'failed', 'tested'])
-        self._disco_bake.get_ami_creation_time = DiscoBake.extract_ami_creation_time_from_ami_name
+        # A class spec is far cheaper than an autospec and still rejects misspelled DiscoBake methods;
+        # connection is an instance attribute, so it has to be set explicitly.
+        self._disco_bake = MagicMock(spec=DiscoBake)
+        self._disco_bake.connection = MagicMock()
+        self._disco_bake.ami_stages.return_value = ['untested', 'failed', 'tested']
+        self._disco_bake.get_ami_creation_time = attrgetter('creation_time')
         self._ci_deploy = DiscoDeploy(
             self._disco_aws, self._test_aws, self._disco_bake, self._disco_group, self._disco_elb,
-            self._disco_ssm, pipeline_definition=MOCK_PIPELINE_DEFINITION, ami=None, hostclass=None,
-            allow_any_hostclass=False, config=get_mock_config(MOCK_CONFIG_DEFINITON))
-        self._ci_deploy._disco_aws.terminate = MagicMock()
-        self._amis = []
-        self._amis_by_name = {}
-        self.add_ami('mhcfoo 1', 'untested')
-        self.add_ami('mhcbar 2', 'tested')
-        self.add_ami('mhcbar 3', 'tested', is_private=True)
-        self.add_ami('mhcfoo 4', 'tested')
-        self.add_ami('mhcfoo 5', None)
-        self.add_ami('mhcbar 1', 'tested')
-        self.add_ami('mhcfoo 2', 'tested')
-        self.add_ami('mhcfoo 3', 'tested')
-        self.add_ami('mhcfoo 6', 'untested')
-        self.add_ami('mhcnew 1', 'untested')
-        self.add_ami('mhcfoo 7', 'failed')
-        self.add_ami('mhcfoo 8', 'untested', is_private=True)
-        self.add_ami('mhcfoo 9', None, is_private=True)
-        self.add_ami('mhcfoo 10', 'tested', is_private=True)
-        self.add_ami('mhcfoo 11', 'failed', is_private=True)
-        self.add_ami('mhcintegrated 1', None)
-        self.add_ami('mhcintegrated 2', 'tested')
-        self.add_ami('mhcintegrated 3', None)
-        self.add_ami('mhcbluegreen 1', 'tested')
-        self.add_ami('mhcbluegreen 2', 'untested')
-        self.add_ami('mhcbluegreennondeployable 1', 'tested')
-        self.add_ami('mhcbluegreennondeployable 2', 'untested')
-        self.add_ami('mhctimedautoscale 1', 'untested')
-        self._ci_deploy._disco_bake.list_amis = MagicMock(return_value=self._amis)
+            self._disco_ssm, ami=None, hostclass=None, allow_any_hostclass=False,
+            pipeline_definition=[dict(entry) for entry in MOCK_PIPELINE_DEFINITION],
+            config=self._MOCK_CONFIG)
+        self._amis = list(self._TEMPLATE_AMIS)
+        self._amis_by_name = dict(self._TEMPLATE_AMIS_BY_NAME)
+        self._ci_deploy._disco_bake.list_amis.return_value = self._amis
         self.init_latest_running_amis()
 
+
+class DiscoDeployTests(DiscoDeployTestBase):
+    '''Test DiscoDeploy class'''
+
     def test_filter_with_ami_restriction(self):
         '''Tests that filter on ami works when ami is set'''
-        self._ci_deploy._restrict_amis = [self._amis_by_name['mhcbar 2'].id]
+        self._ci_deploy._restrict_amis = [self._AMI_MHCBAR_2.id]
         self.assertEqual(self._ci_deploy._filter_amis(self._amis),
-                         [self._amis_by_name['mhcbar 2']])
+                         [self._AMI_MHCBAR_2])
 
     def test_filter_on_hostclass_wo_restriction(self):
         '''Tests that filter on hostclass does nothing when filtering is not restricted'''
@@ -248,37 +388,19 @@ class DiscoDeployTests(TestCase):
         '''Tests that filter on hostclass filters when the filtering hostclass is set'''
         self._ci_deploy._restrict_hostclass = 'mhcbar'
         self.assertEqual(self._ci_deploy._filter_amis(self._amis),
-                         [self._amis_by_name['mhcbar 2'], self._amis_by_name['mhcbar 3'],
+                         [self._AMI_MHCBAR_2, self._AMI_MHCBAR_3,
                           self._amis_by_name['mhcbar 1']])
 
     def test_filter_with_pipeline_restriction(self):
         '''Tests that filter on hostclass filters to pipeline when no hostclass filter set'''
         self.assertEqual(self._ci_deploy._filter_amis(self._amis),
-                         [self._amis_by_name["mhcfoo 1"],
-                          self._amis_by_name["mhcfoo 4"],
-                          self._amis_by_name["mhcfoo 5"],
-                          self._amis_by_name["mhcfoo 2"],
-                          self._amis_by_name["mhcfoo 3"],
-                          self._amis_by_name["mhcfoo 6"],
-                          self._amis_by_name["mhcfoo 7"],
-                          self._amis_by_name["mhcfoo 8"],
-                          self._amis_by_name["mhcfoo 9"],
-                          self._amis_by_name["mhcfoo 10"],
-                          self._amis_by_name["mhcfoo 11"],
-                          self._amis_by_name["mhcintegrated 1"],
-                          self._amis_by_name["mhcintegrated 2"],
-                          self._amis_by_name["mhcintegrated 3"],
-                          self._amis_by_name["mhcbluegreen 1"],
-                          self._amis_by_name["mhcbluegreen 2"],
-                          self._amis_by_name["mhcbluegreennondeployable 1"],
-                          self._amis_by_name["mhcbluegreennondeployable 2"],
-                          self._amis_by_name["mhctimedautoscale 1"]])
+                         self._PIPELINE_AMIS)
 
     def test_filter_by_hostclass_beats_pipeline(self):
         '''Tests that filter overrides pipeline filtering when hostclass is set'''
         self._ci_deploy._restrict_hostclass = 'mhcbar'
         self.assertEqual(self._ci_deploy._filter_amis(self._amis),
-                         [self._amis_by_name['mhcbar 2'], self._amis_by_name['mhcbar 3'],
+                         [self._AMI_MHCBAR_2, self._AMI_MHCBAR_3,
                           self._amis_by_name['mhcbar 1']])
 
     def test_all_stage_amis_with_any_hostclass(self):
@@ -289,34 +411,16 @@ class DiscoDeployTests(TestCase):
     def test_all_stage_amis_without_any_hostclass(self):
         '''Tests that all_stage_amis calls list_amis correctly with restrictions'''
         self.assertEqual(self._ci_deploy.all_stage_amis,
-                         [self._amis_by_name["mhcfoo 1"],
-                          self._amis_by_name["mhcfoo 4"],
-                          self._amis_by_name["mhcfoo 5"],
-                          self._amis_by_name["mhcfoo 2"],
-                          self._amis_by_name["mhcfoo 3"],
-                          self._amis_by_name["mhcfoo 6"],
-                          self._amis_by_name["mhcfoo 7"],
-                          self._amis_by_name["mhcfoo 8"],
-                          self._amis_by_name["mhcfoo 9"],
-                          self._amis_by_name["mhcfoo 10"],
-                          self._amis_by_name["mhcfoo 11"],
-                          self._amis_by_name["mhcintegrated 1"],
-                          self._amis_by_name["mhcintegrated 2"],
-                          self._amis_by_name["mhcintegrated 3"],
-                          self._amis_by_name["mhcbluegreen 1"],
-                          self._amis_by_name["mhcbluegreen 2"],
-                          self._amis_by_name["mhcbluegreennondeployable 1"],
-                          self._amis_by_name["mhcbluegreennondeployable 2"],
-                          self._amis_by_name["mhctimedautoscale 1"]])
+                         self._PIPELINE_AMIS)
 
     def test_get_newest_in_either_map(self):
         '''Tests that get_newest_in_either_map works with simple input'''
         list_a = [self.mock_ami("mhcfoo 1"), self.mock_ami("mhcbar 2"), self.mock_ami("mhcmoo 1")]
         list_b = [self.mock_ami("mhcfoo 3"), self.mock_ami("mhcbar 1"), self.mock_ami("mhcmoo 2")]
         list_c = [list_b[0], list_a[1], list_b[2]]
-        map_a = {DiscoBake.ami_hostclass(ami): ami for ami in list_a}
-        map_b = {DiscoBake.ami_hostclass(ami): ami for ami in list_b}
-        map_c = {DiscoBake.ami_hostclass(ami): ami for ami in list_c}
+        map_a = {ami.hostclass: ami for ami in list_a}
+        map_b = {ami.hostclass: ami for ami in list_b}
+        map_c = {ami.hostclass: ami for ami in list_c}
         self.assertEqual(self._ci_deploy.get_newest_in_either_map(map_a, map_b), map_c)
 
     def test_get_newest_in_either_map_old_first(self):
@@ -324,9 +428,9 @@ class DiscoDeployTests(TestCase):
         list_a = [self.mock_ami("mhcfoo 1"), self.mock_ami("mhcbar 2")]
         list_b = [self.mock_ami("mhcfoo 3"), self.mock_ami("mhcbar 1"), self.mock_ami("mhcmoo 2")]
         list_c = [list_b[0], list_a[1], list_b[2]]
-        map_a = {DiscoBake.ami_hostclass(ami): ami for ami in list_a}
-        map_b = {DiscoBake.ami_hostclass(ami): ami for ami in list_b}
-        map_c = {DiscoBake.ami_hostclass(ami): ami for ami in list_c}
+        map_a = {ami.hostclass: ami for ami in list_a}
+        map_b = {ami.hostclass: ami for ami in list_b}
+        map_c = {ami.hostclass: ami for ami in list_c}
         self.assertEqual(self._ci_deploy.get_newest_in_either_map(map_a, map_b), map_c)
 
     def test_get_latest_untested_amis_works(self):
@@ -342,19 +446,18 @@ class DiscoDeployTests(TestCase):
     def test_get_latest_tested_amis_works_inc(self):
         '''Tests that get_latest_tested_amis() returns non private latest tested amis (inc)'''
         self.assertEqual(self._ci_deploy.get_latest_tested_amis()['mhcfoo'],
-                         self._amis_by_name['mhcfoo 4'])
+                         self._AMI_MHCFOO_4)
 
     def test_get_latest_tested_amis_works_dec(self):
         '''Tests that get_latest_tested_amis() returns non private latest tested amis (dec)'''
         self._ci_deploy._allow_any_hostclass = True
         self.assertEqual(self._ci_deploy.get_latest_tested_amis()['mhcbar'],
-                         self._amis_by_name['mhcbar 2'])
+                         self._AMI_MHCBAR_2)
 
     def test_get_latest_tested_amis_works_no_date(self):
         '''Tests that get_latest_tested_amis() works when an AMI is without a date'''
         def _special_date(ami):
-            return (None if ami.name == 'mhcfoo 4' else
-                    DiscoBake.extract_ami_creation_time_from_ami_name(ami))
+            return None if ami.name == 'mhcfoo 4' else ami.creation_time
         self._ci_deploy._disco_bake.get_ami_creation_time = _special_date
         self.assertEqual(self._ci_deploy.get_latest_tested_amis()['mhcfoo'],
                          self._amis_by_name['mhcfoo 3'])
@@ -367,32 +470,32 @@ class DiscoDeployTests(TestCase):
     def test_get_test_amis_from_any_hostclass(self):
         '''Tests that we can find the next untested ami to test for each hostclass without restrictions'''
         self._ci_deploy._allow_any_hostclass = True
-        self.assertEqual([ami.name for ami in self._ci_deploy.get_test_amis()],
-                         ['mhcfoo 6',
-                          'mhcbluegreennondeployable 2',
-                          'mhcnew 1',
-                          'mhcbluegreen 2',
-                          'mhctimedautoscale 1'])
+        self.assertItemsEqual([ami.name for ami in self._ci_deploy.get_test_amis()],
+                             ['mhcfoo 6',
+                              'mhcbluegreennondeployable 2',
+                              'mhcnew 1',
+                              'mhcbluegreen 2',
+                              'mhctimedautoscale 1'])
 
     def test_get_test_amis_from_pipeline(self):
         '''
         Tests that we can find the next non private untested ami to test
         for each hostclass restricted to pipeline
         '''
-        self.assertEqual([ami.name for ami in self._ci_deploy.get_test_amis()],
-                         ['mhcfoo 6', 'mhcbluegreennondeployable 2',
-                          'mhcbluegreen 2', 'mhctimedautoscale 1'])
+        self.assertItemsEqual([ami.name for ami in self._ci_deploy.get_test_amis()],
+                             ['mhcfoo 6', 'mhcbluegreennondeployable 2',
+                              'mhcbluegreen 2', 'mhctimedautoscale 1'])
 
     def test_get_failed_amis(self):
         '''Tests that we can find the next non private failed ami to test for each hostclass'''
-        self.assertEqual([ami.name for ami in self._ci_deploy.get_failed_amis()],
-                         ['mhcfoo 7'])
+        self.assertItemsEqual([ami.name for ami in self._ci_deploy.get_failed_amis()],
+                             ['mhcfoo 7'])
 
     def test_get_latest_running_amis(self):
         '''get_latest_running_amis returns the latest non private running AMIs'''
-        amis = [self._amis_by_name['mhcintegrated 1'], self._amis_by_name['mhcintegrated 2'],
-                self._amis_by_name['mhcbar 2'], self._amis_by_name['mhcbar 3']]
-        self._ci_deploy._disco_bake.get_amis = MagicMock(return_value=amis)
+        amis = [self._amis_by_name['mhcintegrated 1'], self._AMI_MHCINTEGRATED_2,
+                self._AMI_MHCBAR_2, self._AMI_MHCBAR_3]
+        self._ci_deploy._disco_bake.get_amis.return_value = amis
         self._ci_deploy.get_latest_running_amis = self._real_get_latest_running_amis
         latest_running_amis = self._ci_deploy.get_latest_running_amis()
         self.assertEqual(latest_running_amis['mhcintegrated'], amis[1])
@@ -400,24 +503,24 @@ class DiscoDeployTests(TestCase):
 
     def test_get_update_amis_untested(self):
         '''Tests that we can find the next untested AMI to deploy in prod'''
-        amis = {"mhcintegrated": self._amis_by_name['mhcintegrated 2']}
-        self._ci_deploy.get_latest_running_amis = MagicMock(return_value=amis)
-        self.assertEqual([ami.name for ami in self._ci_deploy.get_update_amis()],
-                         ['mhcbluegreen 1', 'mhcintegrated 3'])
+        amis = {"mhcintegrated": self._AMI_MHCINTEGRATED_2}
+        self.stub_latest_running_amis(amis)
+        self.assertItemsEqual([ami.name for ami in self._ci_deploy.get_update_amis()],
+                             ['mhcbluegreen 1', 'mhcintegrated 3'])
 
     def test_get_update_amis_tested(self):
         '''Tests that we can find the next tested AMI to deploy in prod'''
-        amis = {"mhcintegrated": self._amis_by_name['mhcintegrated 2']}
+        amis = {"mhcintegrated": self._AMI_MHCINTEGRATED_2}
         self.add_ami('mhcintegrated 4', 'tested')
-        self._ci_deploy.get_latest_running_amis = MagicMock(return_value=amis)
-        self.assertEqual([ami.name for ami in self._ci_deploy.get_update_amis()],
-                         ['mhcbluegreen 1', 'mhcintegrated 4'])
+        self.stub_latest_running_amis(amis)
+        self.assertItemsEqual([ami.name for ami in self._ci_deploy.get_update_amis()],
+                             ['mhcbluegreen 1', 'mhcintegrated 4'])
 
     def test_get_update_amis_none(self):
         '''Tests that we can don't return any amis to update in prod when we are up to date'''
         amis = {"mhcintegrated": self._amis_by_name['mhcintegrated 3'],
                 "mhcbluegreen": self._amis_by_name['mhcbluegreen 2']}
-        self._ci_deploy.get_latest_running_amis = MagicMock(return_value=amis)
+        self.stub_latest_running_amis(amis)
         self.assertEqual(self._ci_deploy.get_update_amis(), [])
 
     def test_get_update_amis_failed(self):
@@ -426,14 +529,14 @@ class DiscoDeployTests(TestCase):
                 "mhcbluegreen": self._amis_by_name['mhcbluegreen 2']}
         self.add_ami('mhcintegrated 4', 'failed')
         self.add_ami('mhcbluegreen 3', 'failed')
-        self._ci_deploy.get_latest_running_amis = MagicMock(return_value=amis)
+        self.stub_latest_running_amis(amis)
         self.assertEqual(self._ci_deploy.get_update_amis(), [])
 
     def test_get_update_amis_not_running(self):
         '''Tests that update an AMI that is not runnng'''
-        self._ci_deploy.get_latest_running_amis = MagicMock(return_value={})
-        self.assertEqual([ami.name for ami in self._ci_deploy.get_update_amis()],
-                         ['mhcbluegreen 1', 'mhcintegrated 3'])
+        self.stub_latest_running_amis({})
+        self.assertItemsEqual([ami.name for ami in self._ci_deploy.get_update_amis()],
+                             ['mhcbluegreen 1', 'mhcintegrated 3'])
 
     def test_is_deployable(self):
         '''Tests if DiscoDeploy.is_deployable works correctly'''
@@ -453,834 +556,135 @@ class DiscoDeployTests(TestCase):
 
     def test_wait_for_smoketests_does_wait(self):
         '''Tests that we wait for autoscaling to complete'''
-        self._ci_deploy._disco_aws.wait_for_autoscaling = MagicMock(side_effect=TimeoutError())
-        self._ci_deploy._disco_aws.smoketest = MagicMock(return_value=True)
+        self._ci_deploy._disco_aws.wait_for_autoscaling.side_effect = _TIMEOUT
+        self._ci_deploy._disco_aws.smoketest.return_value = True
         self.assertEqual(self._ci_deploy.wait_for_smoketests('ami-12345678', 2), False)
         self._ci_deploy._disco_aws.wait_for_autoscaling.assert_called_with('ami-12345678', 2,
                                                                            group_name=None, launch_time=None)
         self.assertEqual(self._ci_deploy._disco_aws.smoketest.call_count, 0)
 
-    def test_wait_for_smoketests_does_smoke(self):
-        '''Tests that we do smoketests'''
-        self._ci_deploy._disco_aws.wait_for_autoscaling = MagicMock()
-        self._ci_deploy._disco_aws.smoketest = MagicMock(return_value=True)
-        self._ci_deploy._disco_aws.instances_from_amis = MagicMock(return_value=['a', 'b'])
-        self.assertEqual(self._ci_deploy.wait_for_smoketests('ami-12345678', 2), True)
-        self._ci_deploy._disco_aws.wait_for_autoscaling.assert_called_with('ami-12345678', 2,
-                                                                           group_name=None, launch_time=None)
-        self._ci_deploy._disco_aws.instances_from_amis.assert_called_with(['ami-12345678'], None, None)
-        self._ci_deploy._disco_aws.smoketest.assert_called_with(['a', 'b'])
-
-    def test_wait_for_smoketests_does_smoke_time(self):
-        '''Tests that we handle smoketest Timeout'''
-        self._ci_deploy._disco_aws.wait_for_autoscaling = MagicMock()
-        self._ci_deploy._disco_aws.smoketest = MagicMock(side_effect=TimeoutError())
-        self._ci_deploy._disco_aws.instances_from_amis = MagicMock(return_value=['a', 'b'])
-        self.assertEqual(self._ci_deploy.wait_for_smoketests('ami-12345678', 2), False)
-        self._ci_deploy._disco_aws.wait_for_autoscaling.assert_called_with('ami-12345678', 2,
-                                                                           group_name=None, launch_time=None)
-        self._ci_deploy._disco_aws.instances_from_amis.assert_called_with(['ami-12345678'], None, None)
-        self._ci_deploy._disco_aws.smoketest.assert_called_with(['a', 'b'])
-
-    def test_wait_for_smoketests_asg_does_smoke(self):
-        '''Tests that we do smoketests'''
-        self._ci_deploy._disco_aws.wait_for_autoscaling = MagicMock()
-        self._ci_deploy._disco_aws.smoketest = MagicMock(return_value=True)
-        self._ci_deploy._disco_aws.instances_from_amis = MagicMock(return_value=['a', 'b'])
-        self.assertEqual(self._ci_deploy.wait_for_smoketests('ami-12345678', 2, group_name='test_group'),
-                         True)
-        self._ci_deploy._disco_aws.wait_for_autoscaling.assert_called_with('ami-12345678', 2,
-                                                                           group_name='test_group',
-                                                                           launch_time=None)
-        self._ci_deploy._disco_aws.instances_from_amis.assert_called_with(['ami-12345678'], 'test_group',
-                                                                          None)
-        self._ci_deploy._disco_aws.smoketest.assert_called_with(['a', 'b'])
-
-    def test_wait_for_smoketests_date_does_smoke(self):
-        '''Tests that we do smoketests'''
-        self._ci_deploy._disco_aws.wait_for_autoscaling = MagicMock()
-        self._ci_deploy._disco_aws.smoketest = MagicMock(return_value=True)
-        self._ci_deploy._disco_aws.instances_from_amis = MagicMock(return_value=['a', 'b'])
-        now = datetime.utcnow()
-        self.assertEqual(self._ci_deploy.wait_for_smoketests('ami-12345678', 2, launch_time=now), True)
+    @parameterized.expand([
+        ("plain", None, None, None, True),
+        ("smoketest_timeout", None, None, _TIMEOUT, False),
+        ("group", 'test_group', None, None, True),
+        ("launch_time", None, datetime(2017, 1, 1, 12, 0), None, True)
+    ])
+    def test_wait_for_smoketests_does_smoke(self, _, group_name, launch_time, smoke_error, expected):
+        '''Tests that we do smoketests on the instances from the AMI, group and launch time'''
+        self._ci_deploy._disco_aws.smoketest.return_value = True
+        self._ci_deploy._disco_aws.smoketest.side_effect = smoke_error
+        self._ci_deploy._disco_aws.instances_from_amis.return_value = ['a', 'b']
+        self.assertEqual(self._ci_deploy.wait_for_smoketests('ami-12345678', 2, group_name=group_name,
+                                                             launch_time=launch_time),
+                         expected)
         self._ci_deploy._disco_aws.wait_for_autoscaling.assert_called_with('ami-12345678', 2,
-                                                                           group_name=None, launch_time=now)
-        self._ci_deploy._disco_aws.instances_from_amis.assert_called_with(['ami-12345678'], None,
-                                                                          now)
+                                                                           group_name=group_name,
+                                                                           launch_time=launch_time)
+        self._ci_deploy._disco_aws.instances_from_amis.assert_called_with(['ami-12345678'], group_name,
+                                                                          launch_time)
         self._ci_deploy._disco_aws.smoketest.assert_called_with(['a', 'b'])
 
     def test_promote_no_throw(self):
         '''_promote_ami swallows exceptions'''
-        self._ci_deploy._disco_bake.promote_ami = MagicMock(side_effect=Exception())
+        self._ci_deploy._disco_bake.promote_ami.side_effect = Exception()
         ami = MagicMock()
         self._ci_deploy._promote_ami(ami, "super")
 
-    def test_blue_green_dry_run(self):
-        """We don't call spinup in a blue/green dry_run"""
-        self.assertIsNone(self._ci_deploy.handle_blue_green_ami(MagicMock(), dry_run=True))
-        self.assertEqual(self._disco_aws.spinup.call_count, 0)
+    def test_update_ami_not_in_pipeline(self):
+        '''Test update_ami handling of non-pipeline hostclass'''
+        ami = self.mock_ami("mhcbar 1")
+        self._ci_deploy.is_deployable = MagicMock()
+        self.assertRaises(RuntimeError, self._ci_deploy.update_ami, ami, dry_run=False)
+        self.assertEqual(self._ci_deploy.is_deployable.call_count, 0)
 
-    def test_bg_deploy_works_with_no_orig_group(self):
-        '''Blue/green deploy works with no existing group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        new_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (0, "")
-        self.assertIsNone(self._ci_deploy.test_ami(ami, dry_run=False))
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_aws.spinup.assert_has_calls(
-            [call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes', 'max_size': 2,
-                    'min_size': 2, 'integration_test': "blue_green_service", 'desired_size': 2,
-                    'smoke_test': 'no', 'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True),
-             call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes',
-                    'min_size': 2, 'desired_size': 2, 'max_size': 2,
-                    'integration_test': "blue_green_service", 'smoke_test': 'no',
-                    'hostclass': 'mhcbluegreen'}], group_name=new_group.name)])
-        self._disco_group.delete_groups.assert_not_called()
-        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+    def test_test_with_amis(self):
+        '''Test test with amis'''
+        self._ci_deploy.test_ami = MagicMock()
+        self._ci_deploy.test()
+        self.assertEqual(self._ci_deploy.test_ami.call_count, 1)
 
-    def test_bg_nodeploy_works(self):
-        '''Blue/green deploy works when the ami is not deployable'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreennondeployable 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        new_group = self.mock_group("mhcbluegreennondeployable")
-        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (0, "")
-        self.assertIsNone(self._ci_deploy.test_ami(ami, dry_run=False))
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_aws.spinup.assert_called_once_with([{
-            'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'no', 'min_size': 1, 'max_size': 1,
-            'integration_test': "blue_green_service", 'desired_size': 1, 'smoke_test': 'no',
-            'hostclass': 'mhcbluegreennondeployable'}], testing=True, create_if_exists=True)
-        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
-        self._disco_elb.delete_elb.assert_not_called()
+    def test_test_with_amis_ticketid(self):
+        '''Test test with amis and calls to socify'''
+        self._ci_deploy.test_ami = MagicMock()
 
-    def test_bg_deploy_works_with_original_group(self):
-        '''Blue/green deploy works with an existing group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        old_group = self.mock_group("mhcbluegreen", min_size=2, max_size=4, desired_size=3)
-        new_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (0, "")
-        self.assertIsNone(self._ci_deploy.test_ami(ami, dry_run=False))
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_aws.spinup.assert_has_calls(
-            [call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes',
-                    'min_size': 2, 'integration_test': "blue_green_service", 'desired_size': 3, 'max_size': 4,
-                    'smoke_test': 'no', 'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True),
-             call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes',
-                    'min_size': 2, 'desired_size': 3, 'max_size': 4,
-                    'integration_test': "blue_green_service", 'smoke_test': 'no',
-                    'hostclass': 'mhcbluegreen'}], group_name=new_group.name)])
-        self._disco_group.delete_groups.assert_called_once_with(group_name=old_group.name, force=True)
-        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+        self._ci_deploy.test(ticket_id="AL-1102")
+        self.assertEqual(self._ci_deploy.test_ami.call_count, 1)
+        self.assertEqual(self._requests.call_count, 2)
 
-    def test_bg_deploy_with_bad_new_group_name(self):
-        '''Blue/green deploy throws an exception if it gets the wrong new group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.return_value = group.__dict__
-        self.assertRaises(RuntimeError, self._ci_deploy.test_ami, ami, dry_run=False)
+    def test_test_with_amis_ticketid_error(self):
+        '''Test test with amis and calls to socify'''
+        self._ci_deploy.test_ami = MagicMock(side_effect=RuntimeError())
 
-    def test_bg_deploy_with_failing_tests(self):
-        '''Blue/green deploy fails if tests fail, and destroys the new group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=False)
-        old_group = self.mock_group("mhcbluegreen", min_size=2, max_size=4, desired_size=3)
-        new_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
-        self.assertRaises(RuntimeError, self._ci_deploy.test_ami, ami, dry_run=False)
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'failed')
-        self._disco_aws.spinup.assert_called_once_with([{
-            'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes', 'min_size': 2,
-            'integration_test': "blue_green_service", 'desired_size': 3, 'max_size': 4, 'smoke_test': 'no',
-            'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True)
-        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
-        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+        with self.assertRaises(RuntimeError):
+            self._ci_deploy.test(ticket_id="AL-1102")
 
-    def test_bg_deploy_when_unable_to_test(self):
-        '''Blue/green deploy fails if unable to run tests, and destroys the new group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(side_effect=IntegrationTestError)
-        old_group = self.mock_group("mhcbluegreen", min_size=2, max_size=4, desired_size=3)
-        new_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
-        self.assertRaises(RuntimeError, self._ci_deploy.test_ami, ami, dry_run=False)
-        self._disco_aws.spinup.assert_called_once_with([{
-            'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes', 'min_size': 2,
-            'integration_test': "blue_green_service", 'desired_size': 3, 'max_size': 4, 'smoke_test': 'no',
-            'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True)
-        self._disco_bake.promote_ami.assert_not_called()
-        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
-        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+    def test_test_with_amis_validate_failed(self):
+        '''Test test with amis and failed socify validate'''
+        self._ci_deploy.test_ami = MagicMock()
 
-    def test_bg_deploy_with_failing_elbs(self):
-        '''Blue/green deploy fails if elbs fail, and destroys the new group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        self._disco_elb.wait_for_instance_health_state.side_effect = TimeoutError
-        old_group = self.mock_group("mhcbluegreen", min_size=2, max_size=4, desired_size=3)
-        new_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        instance_ids = [inst.instance_id for inst in instances]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (0, "")
-        self.assertRaises(TimeoutError, self._ci_deploy.test_ami, ami, dry_run=False)
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_elb.wait_for_instance_health_state.assert_called_with(hostclass="mhcbluegreen",
-                                                                          instance_ids=instance_ids)
-        self._disco_aws.spinup.assert_has_calls(
-            [call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes',
-                    'min_size': 2, 'integration_test': "blue_green_service", 'desired_size': 3, 'max_size': 4,
-                    'smoke_test': 'no', 'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True),
-             call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes',
-                    'min_size': 2, 'desired_size': 3, 'max_size': 4,
-                    'integration_test': "blue_green_service", 'smoke_test': 'no',
-                    'hostclass': 'mhcbluegreen'}], group_name=new_group.name)])
-        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
-        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+        self._requests.post(SOCIFY_API_BASE + "/validate", json=_VALIDATE_FAILED)
 
-    def test_bg_deploy_with_bad_testing_mode(self):
-        '''Blue/green deploy fails if unable to exit testing mode, and destroys the new group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        old_group = self.mock_group("mhcbluegreen", min_size=2, max_size=4, desired_size=3)
-        new_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (1, "")
-        self.assertRaises(RuntimeError, self._ci_deploy.test_ami, ami, dry_run=False)
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_elb.wait_for_instance_health_state.assert_not_called()
-        self._disco_aws.spinup.assert_called_once_with([{
-            'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes', 'min_size': 2,
-            'integration_test': "blue_green_service", 'desired_size': 3, 'max_size': 4, 'smoke_test': 'no',
-            'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True)
-        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
-        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+        with self.assertRaisesRegexp(RuntimeError, _SOC_VALIDATION_FAILED):
+            self._ci_deploy.test(ticket_id="AL-1102")
 
-    def test_bg_with_hc_not_in_pl_and_no_group(self):
-        '''Blue/green is non-deployable if hostclass is not in pipeline, and dies with no existing group'''
-        ami = MagicMock()
-        ami.name = "mhcfoo 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        new_group = self.mock_group("mhcfoo")
-        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (1, "")
-        self.assertIsNone(self._ci_deploy.test_ami(ami,
-                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
-                                                   dry_run=False))
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_elb.wait_for_instance_health_state.assert_not_called()
-        self._disco_aws.spinup.assert_called_once_with(
-            [{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'no', 'min_size': 1,
-              'integration_test': None, 'desired_size': 1, 'max_size': 1, 'smoke_test': 'no',
-              'hostclass': 'mhcfoo'}], testing=True, create_if_exists=True)
-        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
+        self.assertEqual(self._ci_deploy.test_ami.call_count, 0)
+        self.assertEqual(self._requests.call_count, 2)
 
-    def test_bg_with_hc_not_in_pl_and_group(self):
-        '''Blue/green is non-deployable if hostclass is not in pipeline, dies, and updates existing group'''
-        ami = MagicMock()
-        ami.name = "mhcfoo 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        old_group = self.mock_group("mhcfoo", min_size=2, max_size=4, desired_size=3)
-        new_group = self.mock_group("mhcfoo")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (1, "")
-        self.assertIsNone(self._ci_deploy.test_ami(ami,
-                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
-                                                   dry_run=False))
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_elb.wait_for_instance_health_state.assert_not_called()
-        self._disco_aws.spinup.assert_has_calls(
-            [call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'no', 'min_size': 2,
-                    'integration_test': None, 'desired_size': 3, 'max_size': 4, 'smoke_test': 'no',
-                    'hostclass': 'mhcfoo'}], testing=True, create_if_exists=True),
-             call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'no', 'min_size': 2,
-                    'integration_test': None, 'desired_size': 3, 'max_size': 4, 'smoke_test': 'no',
-                    'hostclass': 'mhcfoo'}], group_name=old_group.name)])
-        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
+    def test_test_with_amis_validate_error(self):
+        '''Test test with amis and error returned by socify validate'''
+        self._ci_deploy.test_ami = MagicMock()
 
-    def test_bg_with_spinup_error_and_og(self):
-        '''Blue/green can handle an an exception when spinning up the new ASG with old group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        self._disco_aws.spinup.side_effect = Exception
-        old_group = self.mock_group("mhcbluegreen")
-        new_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
-        self.assertRaises(RuntimeError, self._ci_deploy.test_ami, ami, dry_run=False)
-        self._disco_bake.promote_ami.assert_not_called()
-        self._disco_elb.wait_for_instance_health_state.assert_not_called()
-        self._disco_aws.spinup.assert_called_once_with([{
-            'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes', 'min_size': 1,
-            'integration_test': "blue_green_service", 'desired_size': 1, 'max_size': 1, 'smoke_test': 'no',
-            'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True)
-        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
+        self._requests.post(SOCIFY_API_BASE + "/validate", exc=requests.exceptions.ConnectTimeout)
 
-    def test_bg_with_spinup_error_and_no_og(self):
-        '''Blue/green can handle an an exception when spinning up the new ASG with no old group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        self._disco_aws.spinup.side_effect = Exception
-        new_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
-        self.assertRaises(RuntimeError, self._ci_deploy.test_ami, ami, dry_run=False)
-        self._disco_bake.promote_ami.assert_not_called()
-        self._disco_elb.wait_for_instance_health_state.assert_not_called()
-        self._disco_aws.spinup.assert_called_once_with([{
-            'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes', 'min_size': 2,
-            'integration_test': "blue_green_service", 'desired_size': 2, 'max_size': 2, 'smoke_test': 'no',
-            'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True)
-        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
+        with self.assertRaisesRegexp(RuntimeError, _SOC_VALIDATION_FAILED):
+            self._ci_deploy.test(ticket_id="AL-1102")
 
-    def test_bg_with_spinup_error_and_no_groups(self):
-        '''Blue/green can handle an an exception when spinning up the new ASG with no groups'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        self._disco_aws.spinup.side_effect = Exception
-        self._disco_group.get_existing_group.side_effect = [None, None]
-        self.assertRaises(RuntimeError, self._ci_deploy.test_ami, ami, dry_run=False)
-        self._disco_bake.promote_ami.assert_not_called()
-        self._disco_elb.wait_for_instance_health_state.assert_not_called()
-        self._disco_aws.spinup.assert_called_once_with([{
-            'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes', 'min_size': 2,
-            'integration_test': "blue_green_service", 'desired_size': 2, 'max_size': 2, 'smoke_test': 'no',
-            'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True)
-        self._disco_group.delete_groups.assert_not_called()
+        self.assertEqual(self._ci_deploy.test_ami.call_count, 0)
+        self.assertEqual(self._requests.call_count, 2)
 
-    def test_bg_with_error_and_og_and_no_ng(self):
-        '''Blue/green can handle an an exception when spinning up the new ASG w/ old group and no new group'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        self._disco_aws.spinup.side_effect = Exception
-        old_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, None]
-        self.assertRaises(Exception, self._ci_deploy.test_ami, ami, dry_run=False)
-        self._disco_bake.promote_ami.assert_not_called()
-        self._disco_elb.wait_for_instance_health_state.assert_not_called()
-        self._disco_aws.spinup.assert_called_once_with([{
-            'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes', 'min_size': 1,
-            'integration_test': "blue_green_service", 'desired_size': 1, 'max_size': 1, 'smoke_test': 'no',
-            'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True)
-        self._disco_group.delete_groups.assert_not_called()
+    def test_test_with_amis_soc_event_error(self):
+        '''Test test with amis and failed socify event'''
+        self._ci_deploy.test_ami = MagicMock()
+        self._requests.post(SOCIFY_API_BASE + "/event", json=_EVENT_ERR, status_code=400)
 
-    def test_bg_with_too_many_autoscaling_groups(self):
-        '''Blue/green can handle too many autoscaling groups error when spinning up a new ASG'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        self._disco_aws.spinup.side_effect = TooManyAutoscalingGroups
-        old_group = self.mock_group("mhcbluegreen")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, None]
-        self.assertRaises(TooManyAutoscalingGroups, self._ci_deploy.test_ami, ami, dry_run=False)
-        self._disco_bake.promote_ami.assert_not_called()
-        self._disco_elb.wait_for_instance_health_state.assert_not_called()
-        self._disco_aws.spinup.assert_called_once_with([{
-            'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes', 'min_size': 1,
-            'integration_test': "blue_green_service", 'desired_size': 1, 'max_size': 1, 'smoke_test': 'no',
-            'hostclass': 'mhcbluegreen'}], testing=True, create_if_exists=True)
-        self._disco_group.delete_groups.assert_not_called()
+        self._ci_deploy.test(ticket_id="AL-1102")
+        self.assertEqual(self._ci_deploy.test_ami.call_count, 1)
+        self.assertEqual(self._requests.call_count, 2)
 
-    def test_bg_timed_autoscaling(self):
-        '''Blue/green can handle creating timed autoscaling actions'''
-        ami = MagicMock()
-        ami.name = "mhctimedautoscale 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        new_group = self.mock_group("mhctimedautoscale")
-        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (0, "")
-        self.assertIsNone(self._ci_deploy.test_ami(ami,
-                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
-                                                   dry_run=False))
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_aws.spinup.assert_has_calls(
-            [call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes',
-                    'integration_test': None, 'smoke_test': 'no', 'hostclass': 'mhctimedautoscale',
-                    'min_size': 3, 'desired_size': 6, 'max_size': 6}], create_if_exists=True, testing=True),
-             call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes',
-                    'integration_test': None, 'smoke_test': 'no', 'hostclass': 'mhctimedautoscale',
-                    'min_size': 3, 'desired_size': 6, 'max_size': 6}],
-                  group_name=new_group.name)])
-        self._disco_aws.create_scaling_schedule.assert_called_once_with(
-            min_size='3@30 16 * * 1-5:4@00 17 * * 1-5',
-            desired_size='5@30 16 * * 1-5:6@00 17 * * 1-5',
-            max_size='5@30 16 * * 1-5:6@00 17 * * 1-5',
-            group_name=new_group.name,
-            hostclass=None
-        )
-
-    def test_bg_ta_respects_og_size(self):
-        '''Blue/green can handle creating timed autoscaling actions and respects the old group's sizing'''
-        ami = MagicMock()
-        ami.name = "mhctimedautoscale 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        old_group = self.mock_group("mhctimedautoscale", min_size=2, max_size=4, desired_size=3)
-        new_group = self.mock_group("mhctimedautoscale")
-        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (0, "")
-        self.assertIsNone(self._ci_deploy.test_ami(ami,
-                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
-                                                   dry_run=False))
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_aws.spinup.assert_has_calls(
-            [call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes',
-                    'integration_test': None, 'smoke_test': 'no', 'hostclass': 'mhctimedautoscale',
-                    'min_size': 2, 'desired_size': 3, 'max_size': 4}], create_if_exists=True, testing=True),
-             call([{'ami': 'ami-12345678', 'sequence': 1, 'deployable': 'yes',
-                    'integration_test': None, 'smoke_test': 'no', 'hostclass': 'mhctimedautoscale',
-                    'min_size': 2, 'desired_size': 3, 'max_size': 4}],
-                  group_name=new_group.name)])
-        self._disco_aws.create_scaling_schedule.assert_called_once_with(
-            min_size='3@30 16 * * 1-5:4@00 17 * * 1-5',
-            desired_size='5@30 16 * * 1-5:6@00 17 * * 1-5',
-            max_size='5@30 16 * * 1-5:6@00 17 * * 1-5',
-            group_name=new_group.name,
-            hostclass=None
-        )
-
-    def test_bg_timed_autoscaling_nd(self):
-        '''Blue/green doesn't bother with timed autoscaling for non-deployable hostclasses'''
-        ami = MagicMock()
-        ami.name = "mhctimedautoscalenodeploy 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.wait_for_smoketests = MagicMock(return_value=True)
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=True)
-        new_group = self.mock_group("mhctimedautoscalenodeploy")
-        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
-        instances = [self.mock_instance(), self.mock_instance(), self.mock_instance()]
-        self._disco_group.get_instances.return_value = [_i.__dict__ for _i in instances]
-        self._disco_aws.instances.return_value = instances
-        self._disco_aws.remotecmd.return_value = (0, "")
-        self.assertIsNone(self._ci_deploy.test_ami(ami,
-                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
-                                                   dry_run=False))
-
-        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
-        self._disco_aws.spinup.assert_called_once_with(
-            [{
-                'ami': 'ami-12345678',
-                'sequence': 1,
-                'deployable': 'no',
-                'integration_test': None,
-                'smoke_test': 'no',
-                'hostclass': 'mhctimedautoscalenodeploy',
-                'min_size': 3,
-                'desired_size': 6,
-                'max_size': 6
-            }],
-            create_if_exists=True,
-            testing=True
-        )
-        self._disco_aws.create_scaling_schedule.assert_not_called()
-
-    def test_integration_tests_with_elb(self):
-        '''Integration tests should wait for ELB'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._ci_deploy.get_host = MagicMock()
-        self._disco_aws.remotecmd.return_value = (0, "")
-        self.assertTrue(self._ci_deploy.run_integration_tests(ami, True))
-        self._disco_elb.wait_for_instance_health_state.assert_called_with(hostclass="mhcbluegreen",
-                                                                          testing=True)
-
-    def test_integration_tests_with_elb_timeout(self):
-        '''Integration tests should fail if they can't wait for ELB'''
-        ami = MagicMock()
-        ami.name = "mhcbluegreen 2"
-        ami.id = "ami-12345678"
-        self._disco_elb.wait_for_instance_health_state.side_effect = TimeoutError
-        self.assertFalse(self._ci_deploy.run_integration_tests(ami, True))
-        self._disco_elb.wait_for_instance_health_state.assert_called_with(hostclass="mhcbluegreen",
-                                                                          testing=True)
-
-    def test_get_latest_other_image_id_1(self):
-        '''_get_latest_other_image_id uses amis of old deployed instances'''
-        ami = self.mock_ami("mhcabc 1")
-        inst2 = self.mock_instance()
-        inst2.image_id = ami.id
-        self._ci_deploy._get_old_instances = MagicMock(return_value=[inst2])
-        self._ci_deploy._disco_bake.get_amis = MagicMock(return_value=[ami])
-        self.assertEqual(self._ci_deploy._get_latest_other_image_id('ami-11112222'), ami.id)
-        self._ci_deploy._disco_bake.get_amis.assert_called_with(image_ids=[inst2.image_id])
-
-    def test_get_latest_other_image_id_2(self):
-        '''_get_latest_other_image_id returns latest of multiple amis'''
-        amis = [self.mock_ami("mhcabc 1"), self.mock_ami("mhcabc 3"), self.mock_ami("mhcabc 2")]
-        insts = [self.mock_instance() for _ in range(3)]
-        for index in range(3):
-            insts[index].image_id = amis[index].id
-        self._ci_deploy._get_old_instances = MagicMock(return_value=insts)
-        self._ci_deploy._disco_bake.get_amis = MagicMock(return_value=amis)
-        self.assertEqual(self._ci_deploy._get_latest_other_image_id('ami-11112222'), amis[1].id)
-
-    def test_get_new_instances_with_launch_time(self):
-        '''test get new instances using launch time'''
-        now = datetime.utcnow()
-        ami_id = "ami-12345678"
-
-        inst1 = self.mock_instance()
-        inst1.launch_time = str(now + timedelta(minutes=10))
-        inst2 = self.mock_instance()
-        inst2.launch_time = str(now - timedelta(days=1))
-        instances = [inst1, inst2]
-
-        self._disco_aws.instances = MagicMock(return_value=instances)
-        self.assertEqual(self._ci_deploy._get_new_instances(ami_id, now), [inst1])
-
-    def test_get_new_instances_no_launch_time(self):
-        '''test get new instances without launch time'''
-        now = datetime.utcnow()
-        ami_id = "ami-12345678"
-
-        inst1 = self.mock_instance()
-        inst1.launch_time = str(now + timedelta(minutes=10))
-        inst2 = self.mock_instance()
-        inst2.launch_time = str(now - timedelta(days=1))
-        instances = [inst1, inst2]
-
-        self._disco_aws.instances = MagicMock(return_value=instances)
-        self.assertEqual(self._ci_deploy._get_new_instances(ami_id), instances)
-
-    def test_get_old_instances_with_launch_time(self):
-        '''test get old instances using launch time'''
-        now = datetime.utcnow()
-        ami_id = "ami-12345678"
-
-        inst1 = self.mock_instance()
-        inst1.image_id = ami_id
-        inst1.launch_time = str(now + timedelta(minutes=10))
-        inst2 = self.mock_instance()
-        inst2.image_id = ami_id
-        inst2.launch_time = str(now - timedelta(days=1))
-        instances = [inst1, inst2]
-
-        self._disco_aws.instances = MagicMock(return_value=instances)
-        self.assertEqual(self._ci_deploy._get_old_instances(ami_id, now), [inst2])
-
-    def test_get_old_instances_no_launch_time(self):
-        '''test get old instances without launch time'''
-        now = datetime.utcnow()
-        ami_id1 = "ami-12345678"
-        ami_id2 = "ami-12345699"
-
-        inst1 = self.mock_instance()
-        inst1.image_id = ami_id1
-        inst1.launch_time = str(now + timedelta(minutes=10))
-        inst2 = self.mock_instance()
-        inst2.image_id = ami_id2
-        inst2.launch_time = str(now - timedelta(days=1))
-        instances = [inst1, inst2]
-
-        self._disco_aws.instances = MagicMock(return_value=instances)
-        self.assertEqual(self._ci_deploy._get_old_instances(ami_id1), [inst2])
-
-    def test_pre_test_failure(self):
-        '''Test that an exception is raised if the pre-test fails'''
-        ami = self.mock_ami("mhcintegrated 1 2")
-        self._existing_group.desired_capacity = 2
-        self._ci_deploy.run_integration_tests = MagicMock(return_value=False)
-        self.assertRaises(Exception, self._ci_deploy.test_ami, ami, dry_run=False)
-
-    def test_get_host(self):
-        '''get_host returns a host for the testing hostclass'''
-        self._disco_aws.instances_from_hostclasses = MagicMock(return_value=["i-12345678"])
-        self.assertEqual(self._ci_deploy.get_host(['test_hostclass']), "i-12345678")
-        self.assertEqual(self._disco_aws.smoketest_once.call_count, 1)
-
-    def test_get_host_raises_on_failure(self):
-        '''get_host raises an IntegrationTestError when a host can not be found'''
-        self._disco_aws.instances_from_hostclasses = MagicMock(return_value=["i-12345678"])
-        self._disco_aws.smoketest_once = MagicMock(side_effect=TimeoutError)
-        self.assertRaises(IntegrationTestError, self._ci_deploy.get_host, ['test_hostclass'])
-
-    def test_run_integration_tests_ssh(self):
-        '''run_integration_tests runs the correct command on the correct instance via ssh'''
-        ami = self.mock_ami("mhcintegrated 1 2")
-        self._ci_deploy._disco_aws.remotecmd = MagicMock(return_value=(0, ""))
-        self._disco_aws.instances_from_hostclasses = MagicMock(return_value=["i-12345678"])
-        self.assertEqual(self._ci_deploy.run_integration_tests(ami), True)
-        self._ci_deploy._disco_aws.remotecmd.assert_called_with(
-            "i-12345678", ["test_command", "foo_service"],
-            user="test_user", nothrow=True)
-
-    def test_run_integration_tests_ssm(self):
-        '''run_integration_tests runs the correct command on the correct instance via ssm'''
-        ami = self.mock_ami("mhcssmdocs 1 2")
-        self._disco_aws.instances_from_hostclasses = MagicMock(return_value=[MagicMock(id="i-12345678")])
-        self._ci_deploy._disco_ssm.execute.return_value = True
-        self.assertEqual(self._ci_deploy.run_integration_tests(ami), True)
-        self._ci_deploy._disco_ssm.execute.assert_called_with(
-            instance_ids=["i-12345678"],
-            document_name=SSM_DOC_INTEGRATION_TESTS,
-            parameters={
-                "command": ["test_command"],
-                "test": ["ssm_service"],
-                "user": ["test_user"]
-            },
-            comment=ANY
-        )
-
-    def test_setting_testing_mode_ssm(self):
-        '''toggles testing mode correctly via ssm'''
-        self._ci_deploy._disco_ssm.execute.return_value = True
-        self.assertEqual(
-            self._ci_deploy._set_testing_mode(
-                "mhcssmdocs",
-                [MagicMock(id="i-12345678")],
-                True
-            ),
-            True
-        )
-        self._ci_deploy._disco_ssm.execute.assert_called_with(
-            instance_ids=["i-12345678"],
-            document_name=SSM_DOC_TESTING_MODE,
-            parameters={
-                "mode": ["on"]
-            },
-            comment=ANY
-        )
-
-    def test_setting_testing_mode_ssm_error(self):
-        '''toggling testing mode fails if execute fails'''
-        self._ci_deploy._disco_ssm.execute.return_value = False
-        self.assertEqual(
-            self._ci_deploy._set_testing_mode(
-                "mhcssmdocs",
-                [MagicMock(id="i-12345678")],
-                True
-            ),
-            False
-        )
-        self._ci_deploy._disco_ssm.execute.assert_called_with(
-            instance_ids=["i-12345678"],
-            document_name=SSM_DOC_TESTING_MODE,
-            parameters={
-                "mode": ["on"]
-            },
-            comment=ANY
-        )
-
-    def test_run_integration_tests_get_host_fail(self):
-        '''run_integration_tests raises exception when a get_host fails to find a host'''
-        ami = self.mock_ami("mhcintegrated 1 2")
-        self._ci_deploy._disco_aws.remotecmd = MagicMock(return_value=(0, ""))
-        self._disco_aws.instances_from_hostclasses = MagicMock(return_value=[])
-        self.assertRaises(IntegrationTestError, self._ci_deploy.run_integration_tests, ami)
-
-    def test_update_ami_not_in_pipeline(self):
-        '''Test update_ami handling of non-pipeline hostclass'''
-        ami = self.mock_ami("mhcbar 1")
-        self._ci_deploy.is_deployable = MagicMock()
-        self.assertRaises(RuntimeError, self._ci_deploy.update_ami, ami, dry_run=False)
-        self.assertEqual(self._ci_deploy.is_deployable.call_count, 0)
-
-    def test_test_with_amis(self):
-        '''Test test with amis'''
-        self._ci_deploy.test_ami = MagicMock()
-        self._ci_deploy.test()
-        self.assertEqual(self._ci_deploy.test_ami.call_count, 1)
-
-    @requests_mock.Mocker()
-    def test_test_with_amis_ticketid(self, mock_requests):
-        '''Test test with amis and calls to socify'''
-        self._ci_deploy.test_ami = MagicMock()
-        mock_validate_response = {
-            'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
-            'result': {'status': 'Passed', 'err_msgs': []}
-        }
-        mock_event_response = {
-            'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", json=mock_validate_response, status_code=200)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_event_response)
-
-        self._ci_deploy.test(ticket_id="AL-1102")
-        self.assertEqual(self._ci_deploy.test_ami.call_count, 1)
-        self.assertEqual(mock_requests.call_count, 2)
-
-    @requests_mock.Mocker()
-    def test_test_with_amis_ticketid_error(self, mock_requests):
-        '''Test test with amis and calls to socify'''
-        self._ci_deploy.test_ami = MagicMock(side_effect=RuntimeError())
-        mock_validate_response = {
-            'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
-            'result': {'status': 'Passed', 'err_msgs': []}
-        }
-        mock_event_response = {
-            'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", json=mock_validate_response, status_code=200)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_event_response)
-
-        with self.assertRaises(RuntimeError):
-            self._ci_deploy.test(ticket_id="AL-1102")
-
-    @requests_mock.Mocker()
-    def test_test_with_amis_validate_failed(self, mock_requests):
-        '''Test test with amis and failed socify validate'''
-        self._ci_deploy.test_ami = MagicMock()
-
-        mock_validate_response = {
-            'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
-            'result': {'status': 'Failed', 'err_msgs': ["Some error message"]}
-        }
-        mock_event_response = {
-            'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", json=mock_validate_response, status_code=200)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_event_response)
-
-        with self.assertRaisesRegexp(RuntimeError,
-                                     "The SOC validation of the associated Ticket and AMI failed."):
-            self._ci_deploy.test(ticket_id="AL-1102")
-
-        self.assertEqual(self._ci_deploy.test_ami.call_count, 0)
-        self.assertEqual(mock_requests.call_count, 2)
-
-    @requests_mock.Mocker()
-    def test_test_with_amis_validate_error(self, mock_requests):
-        '''Test test with amis and error returned by socify validate'''
-        self._ci_deploy.test_ami = MagicMock()
-
-        mock_event_response = {
-            'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", exc=requests.exceptions.ConnectTimeout)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_event_response)
-
-        with self.assertRaisesRegexp(RuntimeError,
-                                     "The SOC validation of the associated Ticket and AMI failed."):
-            self._ci_deploy.test(ticket_id="AL-1102")
-
-        self.assertEqual(self._ci_deploy.test_ami.call_count, 0)
-        self.assertEqual(mock_requests.call_count, 2)
-
-    @requests_mock.Mocker()
-    def test_test_with_amis_soc_event_error(self, mock_requests):
-        '''Test test with amis and failed socify event'''
-        self._ci_deploy.test_ami = MagicMock()
-        mock_validate_response = {
-            'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
-            'result': {'status': 'Passed', 'err_msgs': []}
-        }
-        mock_response = {
-            'errorMessage': 'SOCIFY failed executing the event request'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", json=mock_validate_response, status_code=200)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_response, status_code=400)
-
-        self._ci_deploy.test(ticket_id="AL-1102")
-        self.assertEqual(self._ci_deploy.test_ami.call_count, 1)
-        self.assertEqual(mock_requests.call_count, 2)
-
-    def test_test_wo_amis(self):
-        '''Test test without amis '''
-        self._ci_deploy.get_test_amis = MagicMock(return_value=[])
-        self._ci_deploy.test_ami = MagicMock()
-        self._ci_deploy.test()
-        self.assertEqual(self._ci_deploy.test_ami.call_count, 0)
+    def test_test_wo_amis(self):
+        '''Test test without amis '''
+        self._ci_deploy.get_test_amis = MagicMock(return_value=[])
+        self._ci_deploy.test_ami = MagicMock()
+        self._ci_deploy.test()
+        self.assertEqual(self._ci_deploy.test_ami.call_count, 0)
 
     def test_test_with_restrict_ami(self):
         '''Test test with specified restrict amis'''
-        self._ci_deploy._restrict_amis = [self._amis_by_name['mhcbar 2'].id]
-        amis = [self._amis_by_name['mhcbar 2']]
-        self._ci_deploy._disco_bake.list_amis = MagicMock(return_value=amis)
+        self._ci_deploy._restrict_amis = [self._AMI_MHCBAR_2.id]
+        amis = [self._AMI_MHCBAR_2]
+        self._ci_deploy._disco_bake.list_amis.return_value = amis
         self._ci_deploy.get_test_amis = MagicMock(return_value=[])
         self._ci_deploy.test_ami = MagicMock()
         self._ci_deploy.test()
         self.assertEqual(self._ci_deploy.get_test_amis.call_count, 0)
-        self._ci_deploy._disco_bake.list_amis.assert_called_with(ami_ids=[self._amis_by_name['mhcbar 2'].id])
+        self._ci_deploy._disco_bake.list_amis.assert_called_with(ami_ids=[self._AMI_MHCBAR_2.id])
         self.assertEqual(self._ci_deploy.test_ami.call_count, 1)
 
     def test_test_with_invalid_restrict_ami(self):
         '''Test test with specified restrict amis'''
-        self._ci_deploy._restrict_amis = [self._amis_by_name['mhcbar 2'].id]
-        self._ci_deploy._disco_bake.list_amis = MagicMock(return_value=[])
+        self._ci_deploy._restrict_amis = [self._AMI_MHCBAR_2.id]
+        self._ci_deploy._disco_bake.list_amis.return_value = []
         self._ci_deploy.get_test_amis = MagicMock(return_value=[])
         self._ci_deploy.test_ami = MagicMock()
         self.assertRaises(RuntimeError, self._ci_deploy.test)
         self.assertEqual(self._ci_deploy.get_test_amis.call_count, 0)
-        self._ci_deploy._disco_bake.list_amis.assert_called_with(ami_ids=[self._amis_by_name['mhcbar 2'].id])
+        self._ci_deploy._disco_bake.list_amis.assert_called_with(ami_ids=[self._AMI_MHCBAR_2.id])
         self.assertEqual(self._ci_deploy.test_ami.call_count, 0)
 
     def test_test_wo_restrict_ami(self):
         '''Test test without specified restrict amis'''
-        self._ci_deploy._disco_bake.list_amis = MagicMock(return_value=[])
-        self._ci_deploy.get_test_amis = MagicMock(return_value=[self._amis_by_name['mhcbar 2']])
+        self._ci_deploy._disco_bake.list_amis.return_value = []
+        self._ci_deploy.get_test_amis = MagicMock(return_value=[self._AMI_MHCBAR_2])
         self._ci_deploy.test_ami = MagicMock()
         self._ci_deploy.test()
         self.assertEqual(self._ci_deploy.get_test_amis.call_count, 1)
@@ -1292,117 +696,62 @@ class DiscoDeployTests(TestCase):
         self._ci_deploy.update()
         self.assertEqual(self._ci_deploy.update_ami.call_count, 1)
 
-    @requests_mock.Mocker()
-    def test_update_with_amis_ticketid(self, mock_requests):
+    def test_update_with_amis_ticketid(self):
         '''Test update with amis and calls to socify'''
         self._ci_deploy.update_ami = MagicMock()
-        mock_validate_response = {
-            'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
-            'result': {'status': 'Passed', 'err_msgs': []}
-        }
-        mock_event_response = {
-            'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", json=mock_validate_response, status_code=200)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_event_response)
 
         self._ci_deploy.update(ticket_id="AL-1102")
         self.assertEqual(self._ci_deploy.update_ami.call_count, 1)
-        self.assertEqual(mock_requests.call_count, 2)
+        self.assertEqual(self._requests.call_count, 2)
 
-    @requests_mock.Mocker()
-    def test_update_with_amis_ticketid_error(self, mock_requests):
+    def test_update_with_amis_ticketid_error(self):
         '''Test update with amis and calls to socify'''
         self._ci_deploy.update_ami = MagicMock(side_effect=RuntimeError())
-        mock_validate_response = {
-            'message': 'SOCIFY has successfully processed the validate request: DeployEvent',
-            'result': {'status': 'Passed', 'err_msgs': []}
-        }
-        mock_event_response = {
-            'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", json=mock_validate_response, status_code=200)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_event_response)
 
         with self.assertRaises(RuntimeError):
             self._ci_deploy.update(ticket_id="AL-1102")
 
-    @requests_mock.Mocker()
-    def test_update_with_amis_validate_failed(self, mock_requests):
+    def test_update_with_amis_validate_failed(self):
         '''Test update with amis and failed socify validate'''
         self._ci_deploy.update_ami = MagicMock()
 
-        mock_validate_response = {
-            'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
-            'result': {'status': 'Failed', 'err_msgs': ["Some error message"]}
-        }
-        mock_event_response = {
-            'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", json=mock_validate_response, status_code=200)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_event_response)
+        self._requests.post(SOCIFY_API_BASE + "/validate", json=_VALIDATE_FAILED)
 
-        with self.assertRaisesRegexp(RuntimeError,
-                                     "The SOC validation of the associated Ticket and AMI failed."):
+        with self.assertRaisesRegexp(RuntimeError, _SOC_VALIDATION_FAILED):
             self._ci_deploy.update(ticket_id="AL-1102")
 
         self.assertEqual(self._ci_deploy.update_ami.call_count, 0)
-        self.assertEqual(mock_requests.call_count, 2)
+        self.assertEqual(self._requests.call_count, 2)
 
-    @requests_mock.Mocker()
-    def test_update_with_amis_validate_error(self, mock_requests):
+    def test_update_with_amis_validate_error(self):
         '''Test test with amis and error returned from validate'''
         self._ci_deploy.update_ami = MagicMock()
 
-        mock_event_response = {
-            'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", exc=requests.exceptions.ConnectTimeout)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_event_response)
+        self._requests.post(SOCIFY_API_BASE + "/validate", exc=requests.exceptions.ConnectTimeout)
 
-        with self.assertRaisesRegexp(RuntimeError,
-                                     "The SOC validation of the associated Ticket and AMI failed."):
+        with self.assertRaisesRegexp(RuntimeError, _SOC_VALIDATION_FAILED):
             self._ci_deploy.update(ticket_id="AL-1102")
 
         self.assertEqual(self._ci_deploy.update_ami.call_count, 0)
-        self.assertEqual(mock_requests.call_count, 2)
+        self.assertEqual(self._requests.call_count, 2)
 
-    @requests_mock.Mocker()
-    def test_update_with_amis_soc_event_error(self, mock_requests):
+    def test_update_with_amis_soc_event_error(self):
         '''Test test with amis and error during Socify event'''
         self._ci_deploy.update_ami = MagicMock()
-        mock_validate_response = {
-            'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
-            'result': {'status': 'Passed', 'err_msgs': []}
-        }
-        mock_response = {
-            'errorMessage': 'SOCIFY failed executing the event request'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", json=mock_validate_response, status_code=200)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_response, status_code=400)
+        self._requests.post(SOCIFY_API_BASE + "/event", json=_EVENT_ERR, status_code=400)
 
         self._ci_deploy.update(ticket_id="AL-1102")
         self.assertEqual(self._ci_deploy.update_ami.call_count, 1)
-        self.assertEqual(mock_requests.call_count, 2)
+        self.assertEqual(self._requests.call_count, 2)
 
-    @requests_mock.Mocker()
     @patch("disco_aws_automation.disco_deploy.DiscoDeployUpdateHelper._get_ami_to_deploy")
-    def test_update_with_invalid_ami_soc_event(self, mock_requests, mock_get_ami):
+    def test_update_with_invalid_ami_soc_event(self, mock_get_ami):
         '''Test update with exception when getting ami and send error event to Socify'''
         mock_get_ami.side_effect = RuntimeError("Invalid amiId")
-        mock_validate_response = {
-            'message': 'SOCIFY-Mock has successfully processed the validate request:: DeployEvent',
-            'result': {'status': 'Passed', 'err_msgs': []}
-        }
-        mock_event_response = {
-            'message': 'SOCIFY-Mock has successfully processed the event: DeployEvent'
-        }
-        mock_requests.post(SOCIFY_API_BASE + "/validate", json=mock_validate_response, status_code=200)
-        mock_requests.post(SOCIFY_API_BASE + "/event", json=mock_event_response)
 
         with self.assertRaisesRegexp(RuntimeError, "Invalid amiId"):
             self._ci_deploy.update(ticket_id="AL-1102")
-        self.assertEqual(mock_requests.call_count, 1)
+        self.assertEqual(self._requests.call_count, 1)
 
     def test_update_wo_amis(self):
         '''Test update without amis'''
@@ -1413,31 +762,31 @@ class DiscoDeployTests(TestCase):
 
     def test_update_with_restrict_ami(self):
         '''Test test with specified restrict amis'''
-        self._ci_deploy._restrict_amis = [self._amis_by_name['mhcbar 2'].id]
-        amis = [self._amis_by_name['mhcbar 2']]
-        self._ci_deploy._disco_bake.list_amis = MagicMock(return_value=amis)
+        self._ci_deploy._restrict_amis = [self._AMI_MHCBAR_2.id]
+        amis = [self._AMI_MHCBAR_2]
+        self._ci_deploy._disco_bake.list_amis.return_value = amis
         self._ci_deploy.get_update_amis = MagicMock(return_value=[])
         self._ci_deploy.update_ami = MagicMock()
         self._ci_deploy.update()
         self.assertEqual(self._ci_deploy.get_update_amis.call_count, 0)
-        self._ci_deploy._disco_bake.list_amis.assert_called_with(ami_ids=[self._amis_by_name['mhcbar 2'].id])
+        self._ci_deploy._disco_bake.list_amis.assert_called_with(ami_ids=[self._AMI_MHCBAR_2.id])
         self.assertEqual(self._ci_deploy.update_ami.call_count, 1)
 
     def test_update_with_invalid_restrict_ami(self):
         '''Test update with specified restrict amis'''
-        self._ci_deploy._restrict_amis = [self._amis_by_name['mhcbar 2'].id]
-        self._ci_deploy._disco_bake.list_amis = MagicMock(return_value=[])
+        self._ci_deploy._restrict_amis = [self._AMI_MHCBAR_2.id]
+        self._ci_deploy._disco_bake.list_amis.return_value = []
         self._ci_deploy.get_update_amis = MagicMock(return_value=[])
         self._ci_deploy.update_ami = MagicMock()
         self.assertRaises(RuntimeError, self._ci_deploy.update)
         self.assertEqual(self._ci_deploy.get_update_amis.call_count, 0)
-        self._ci_deploy._disco_bake.list_amis.assert_called_with(ami_ids=[self._amis_by_name['mhcbar 2'].id])
+        self._ci_deploy._disco_bake.list_amis.assert_called_with(ami_ids=[self._AMI_MHCBAR_2.id])
         self.assertEqual(self._ci_deploy.update_ami.call_count, 0)
 
     def test_update_wo_restrict_ami(self):
         '''Test update without specified restrict amis'''
-        self._ci_deploy._disco_bake.list_amis = MagicMock(return_value=[])
-        self._ci_deploy.get_update_amis = MagicMock(return_value=[self._amis_by_name['mhcbar 2']])
+        self._ci_deploy._disco_bake.list_amis.return_value = []
+        self._ci_deploy.get_update_amis = MagicMock(return_value=[self._AMI_MHCBAR_2])
         self._ci_deploy.update_ami = MagicMock()
         self._ci_deploy.update()
         self.assertEqual(self._ci_deploy.get_update_amis.call_count, 1)
@@ -1477,7 +826,7 @@ class DiscoDeployTests(TestCase):
         self.assertRaises(
             UnknownDeploymentStrategyException,
             self._ci_deploy.test_ami,
-            ami=self._amis_by_name['mhcbar 2'],
+            ami=self._AMI_MHCBAR_2,
             deployment_strategy="foobar",
             dry_run=False
         )
@@ -1487,7 +836,7 @@ class DiscoDeployTests(TestCase):
         self.assertRaises(
             UnknownDeploymentStrategyException,
             self._ci_deploy.update_ami,
-            ami=self._amis_by_name['mhcfoo 4'],
+            ami=self._AMI_MHCFOO_4,
             deployment_strategy="foobar",
             dry_run=False
         )
@@ -1497,14 +846,14 @@ class DiscoDeployTests(TestCase):
         self._ci_deploy.handle_blue_green_ami = MagicMock()
 
         self._ci_deploy.test_ami(
-            ami=self._amis_by_name['mhcfoo 4'],
+            ami=self._AMI_MHCFOO_4,
             deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
             dry_run=False,
             force_deployable=False
         )
 
         self._ci_deploy.test_ami(
-            ami=self._amis_by_name['mhcfoo 4'],
+            ami=self._AMI_MHCFOO_4,
             deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
             dry_run=False,
             force_deployable=True
@@ -1520,14 +869,14 @@ class DiscoDeployTests(TestCase):
         self._ci_deploy.handle_blue_green_ami = MagicMock()
 
         self._ci_deploy.update_ami(
-            ami=self._amis_by_name['mhcfoo 4'],
+            ami=self._AMI_MHCFOO_4,
             deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
             dry_run=False,
             force_deployable=False
         )
 
         self._ci_deploy.update_ami(
-            ami=self._amis_by_name['mhcfoo 4'],
+            ami=self._AMI_MHCFOO_4,
             deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
             dry_run=False,
             force_deployable=True
@@ -1567,3 +916,451 @@ class DiscoDeployTests(TestCase):
         self._ci_deploy._restrict_amis = [self._amis_by_name['mhcfoo 10'].id]
         ami = disco_deploy_helper._get_ami_to_deploy()
         self.assertEqual(ami, self._amis_by_name['mhcfoo 10'])
+
+
+class DiscoDeployBlueGreenTests(DiscoDeployTestBase):
+    '''Test DiscoDeploy blue/green deploys'''
+
+    def setUp(self):
+        super(DiscoDeployBlueGreenTests, self).setUp()
+        # Deploys pass their smoke and integration tests unless a test says otherwise. None of the
+        # tests assert on these calls, so plain functions are enough.
+        self._ci_deploy.wait_for_smoketests = lambda *args, **kwargs: True
+        self._ci_deploy.run_integration_tests = lambda *args, **kwargs: True
+
+    def assert_bg_failure(self, ami, error=RuntimeError, promoted_to=None, deleted_group=None):
+        '''
+        Assert that a blue/green deploy of ami raises error, promotes the AMI to promoted_to (or not at
+        all) and deletes deleted_group (or no group)
+        '''
+        self.assertRaises(error, self._ci_deploy.test_ami, ami, dry_run=False)
+        if promoted_to:
+            self._disco_bake.promote_ami.assert_called_once_with(ami, promoted_to)
+        else:
+            self._disco_bake.promote_ami.assert_not_called()
+        if deleted_group:
+            self._disco_group.delete_groups.assert_called_once_with(group_name=deleted_group, force=True)
+        else:
+            self._disco_group.delete_groups.assert_not_called()
+
+    def test_blue_green_dry_run(self):
+        """We don't call spinup in a blue/green dry_run"""
+        self.assertIsNone(self._ci_deploy.handle_blue_green_ami(MagicMock(), dry_run=True))
+        self.assertEqual(self._disco_aws.spinup.call_count, 0)
+
+    def test_bg_deploy_works_with_no_orig_group(self):
+        '''Blue/green deploy works with no existing group'''
+        ami = _fake_ami()
+        new_group = self.mock_group("mhcbluegreen")
+        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (0, "")
+        self.assertIsNone(self._ci_deploy.test_ami(ami, dry_run=False))
+        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
+        expected_config = _spinup_config(min_size=2, desired_size=2, max_size=2)
+        self.assertEqual(
+            self._disco_aws.spinup.call_args_list,
+            [call([expected_config], testing=True, create_if_exists=True),
+             call([expected_config], group_name=new_group.name)])
+        self._disco_group.delete_groups.assert_not_called()
+        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+
+    def test_bg_nodeploy_works(self):
+        '''Blue/green deploy works when the ami is not deployable'''
+        ami = _fake_ami("mhcbluegreennondeployable 2")
+        new_group = self.mock_group("mhcbluegreennondeployable")
+        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (0, "")
+        self.assertIsNone(self._ci_deploy.test_ami(ami, dry_run=False))
+        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
+        expected_config = _spinup_config(hostclass='mhcbluegreennondeployable', deployable='no', min_size=1,
+                                         desired_size=1, max_size=1)
+        self._disco_aws.spinup.assert_called_once_with([expected_config], testing=True,
+                                                       create_if_exists=True)
+        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
+        self._disco_elb.delete_elb.assert_not_called()
+
+    def test_bg_deploy_works_with_original_group(self):
+        '''Blue/green deploy works with an existing group'''
+        ami = _fake_ami()
+        old_group = self._OLD_BG_GROUP
+        new_group = self.mock_group("mhcbluegreen")
+        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (0, "")
+        self.assertIsNone(self._ci_deploy.test_ami(ami, dry_run=False))
+        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
+        self.assertEqual(
+            self._disco_aws.spinup.call_args_list,
+            [_BG_OLD_GROUP_TESTING_CALL, call([_BG_OLD_GROUP_CONFIG], group_name=new_group.name)])
+        self._disco_group.delete_groups.assert_called_once_with(group_name=old_group.name, force=True)
+        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+
+    def test_bg_deploy_with_bad_new_group_name(self):
+        '''Blue/green deploy throws an exception if it gets the wrong new group'''
+        ami = _fake_ami()
+        group = self.mock_group("mhcbluegreen")
+        self._disco_group.get_existing_group.return_value = group.__dict__
+        self.assertRaises(RuntimeError, self._ci_deploy.test_ami, ami, dry_run=False)
+
+    def test_bg_deploy_with_failing_tests(self):
+        '''Blue/green deploy fails if tests fail, and destroys the new group'''
+        ami = _fake_ami()
+        self._ci_deploy.run_integration_tests = MagicMock(return_value=False)
+        old_group = self._OLD_BG_GROUP
+        new_group = self.mock_group("mhcbluegreen")
+        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
+        self.assert_bg_failure(ami, promoted_to='failed', deleted_group=new_group.name)
+        self.assertEqual(self._disco_aws.spinup.call_args_list, [_BG_OLD_GROUP_TESTING_CALL])
+        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+
+    def test_bg_deploy_when_unable_to_test(self):
+        '''Blue/green deploy fails if unable to run tests, and destroys the new group'''
+        ami = _fake_ami()
+        self._ci_deploy.run_integration_tests = MagicMock(side_effect=IntegrationTestError)
+        old_group = self._OLD_BG_GROUP
+        new_group = self.mock_group("mhcbluegreen")
+        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
+        self.assert_bg_failure(ami, deleted_group=new_group.name)
+        self.assertEqual(self._disco_aws.spinup.call_args_list, [_BG_OLD_GROUP_TESTING_CALL])
+        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+
+    def test_bg_deploy_with_failing_elbs(self):
+        '''Blue/green deploy fails if elbs fail, and destroys the new group'''
+        ami = _fake_ami()
+        self._disco_elb.wait_for_instance_health_state.side_effect = _TIMEOUT
+        old_group = self._OLD_BG_GROUP
+        new_group = self.mock_group("mhcbluegreen")
+        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (0, "")
+        self.assert_bg_failure(ami, error=TimeoutError, promoted_to='tested', deleted_group=new_group.name)
+        self._disco_elb.wait_for_instance_health_state.assert_called_with(hostclass="mhcbluegreen",
+                                                                          instance_ids=self._INSTANCE_IDS)
+        self.assertEqual(
+            self._disco_aws.spinup.call_args_list,
+            [_BG_OLD_GROUP_TESTING_CALL, call([_BG_OLD_GROUP_CONFIG], group_name=new_group.name)])
+        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+
+    def test_bg_deploy_with_bad_testing_mode(self):
+        '''Blue/green deploy fails if unable to exit testing mode, and destroys the new group'''
+        ami = _fake_ami()
+        old_group = self._OLD_BG_GROUP
+        new_group = self.mock_group("mhcbluegreen")
+        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (1, "")
+        self.assert_bg_failure(ami, promoted_to='tested', deleted_group=new_group.name)
+        self._disco_elb.wait_for_instance_health_state.assert_not_called()
+        self.assertEqual(self._disco_aws.spinup.call_args_list, [_BG_OLD_GROUP_TESTING_CALL])
+        self._disco_elb.delete_elb.assert_called_once_with("mhcbluegreen", testing=True)
+
+    def test_bg_with_hc_not_in_pl_and_no_group(self):
+        '''Blue/green is non-deployable if hostclass is not in pipeline, and dies with no existing group'''
+        ami = _fake_ami("mhcfoo 2")
+        new_group = self.mock_group("mhcfoo")
+        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (1, "")
+        self.assertIsNone(self._ci_deploy.test_ami(ami,
+                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
+                                                   dry_run=False))
+        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
+        self._disco_elb.wait_for_instance_health_state.assert_not_called()
+        expected_config = _spinup_config(hostclass='mhcfoo', deployable='no', integration_test=None,
+                                         min_size=1, desired_size=1, max_size=1)
+        self._disco_aws.spinup.assert_called_once_with([expected_config], testing=True,
+                                                       create_if_exists=True)
+        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
+
+    def test_bg_with_hc_not_in_pl_and_group(self):
+        '''Blue/green is non-deployable if hostclass is not in pipeline, dies, and updates existing group'''
+        ami = _fake_ami("mhcfoo 2")
+        old_group = self.mock_group("mhcfoo", min_size=2, max_size=4, desired_size=3)
+        new_group = self.mock_group("mhcfoo")
+        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (1, "")
+        self.assertIsNone(self._ci_deploy.test_ami(ami,
+                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
+                                                   dry_run=False))
+        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
+        self._disco_elb.wait_for_instance_health_state.assert_not_called()
+        expected_config = _spinup_config(hostclass='mhcfoo', deployable='no', integration_test=None,
+                                         min_size=2, desired_size=3, max_size=4)
+        self.assertEqual(
+            self._disco_aws.spinup.call_args_list,
+            [call([expected_config], testing=True, create_if_exists=True),
+             call([expected_config], group_name=old_group.name)])
+        self._disco_group.delete_groups.assert_called_once_with(group_name=new_group.name, force=True)
+
+    @parameterized.expand([
+        ("old_group", True, True, 1, RuntimeError),
+        ("no_old_group", False, True, 2, RuntimeError),
+        ("no_groups", False, False, 2, RuntimeError),
+        ("old_group_no_new_group", True, False, 1, Exception)
+    ])
+    def test_bg_with_spinup_error(self, _, has_old_group, has_new_group, size, error):
+        '''Blue/green can handle an exception when spinning up the new ASG, with or without old/new groups'''
+        ami = _fake_ami()
+        self._disco_aws.spinup.side_effect = Exception
+        old_group = self.mock_group("mhcbluegreen") if has_old_group else None
+        new_group = self.mock_group("mhcbluegreen") if has_new_group else None
+        self._disco_group.get_existing_group.side_effect = [old_group.__dict__ if old_group else None,
+                                                            new_group.__dict__ if new_group else None]
+        self.assert_bg_failure(ami, error=error, deleted_group=new_group.name if new_group else None)
+        self._disco_elb.wait_for_instance_health_state.assert_not_called()
+        # Without an old group to copy, the new group is sized from the pipeline
+        expected_config = _spinup_config(min_size=size, desired_size=size, max_size=size)
+        self._disco_aws.spinup.assert_called_once_with([expected_config], testing=True,
+                                                       create_if_exists=True)
+
+    def test_bg_with_too_many_autoscaling_groups(self):
+        '''Blue/green can handle too many autoscaling groups error when spinning up a new ASG'''
+        ami = _fake_ami()
+        self._disco_aws.spinup.side_effect = TooManyAutoscalingGroups
+        old_group = self.mock_group("mhcbluegreen")
+        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, None]
+        self.assert_bg_failure(ami, error=TooManyAutoscalingGroups)
+        self._disco_elb.wait_for_instance_health_state.assert_not_called()
+        expected_config = _spinup_config(min_size=1, desired_size=1, max_size=1)
+        self._disco_aws.spinup.assert_called_once_with([expected_config], testing=True,
+                                                       create_if_exists=True)
+
+    def test_bg_timed_autoscaling(self):
+        '''Blue/green can handle creating timed autoscaling actions'''
+        ami = _fake_ami("mhctimedautoscale 2")
+        new_group = self.mock_group("mhctimedautoscale")
+        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (0, "")
+        self.assertIsNone(self._ci_deploy.test_ami(ami,
+                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
+                                                   dry_run=False))
+        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
+        expected_config = _spinup_config(hostclass='mhctimedautoscale', integration_test=None, min_size=3,
+                                         desired_size=6, max_size=6)
+        self.assertEqual(
+            self._disco_aws.spinup.call_args_list,
+            [call([expected_config], testing=True, create_if_exists=True),
+             call([expected_config], group_name=new_group.name)])
+        self._disco_aws.create_scaling_schedule.assert_called_once_with(
+            min_size='3@30 16 * * 1-5:4@00 17 * * 1-5',
+            desired_size='5@30 16 * * 1-5:6@00 17 * * 1-5',
+            max_size='5@30 16 * * 1-5:6@00 17 * * 1-5',
+            group_name=new_group.name,
+            hostclass=None
+        )
+
+    def test_bg_ta_respects_og_size(self):
+        '''Blue/green can handle creating timed autoscaling actions and respects the old group's sizing'''
+        ami = _fake_ami("mhctimedautoscale 2")
+        old_group = self.mock_group("mhctimedautoscale", min_size=2, max_size=4, desired_size=3)
+        new_group = self.mock_group("mhctimedautoscale")
+        self._disco_group.get_existing_group.side_effect = [old_group.__dict__, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (0, "")
+        self.assertIsNone(self._ci_deploy.test_ami(ami,
+                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
+                                                   dry_run=False))
+        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
+        expected_config = _spinup_config(hostclass='mhctimedautoscale', integration_test=None, min_size=2,
+                                         desired_size=3, max_size=4)
+        self.assertEqual(
+            self._disco_aws.spinup.call_args_list,
+            [call([expected_config], testing=True, create_if_exists=True),
+             call([expected_config], group_name=new_group.name)])
+        self._disco_aws.create_scaling_schedule.assert_called_once_with(
+            min_size='3@30 16 * * 1-5:4@00 17 * * 1-5',
+            desired_size='5@30 16 * * 1-5:6@00 17 * * 1-5',
+            max_size='5@30 16 * * 1-5:6@00 17 * * 1-5',
+            group_name=new_group.name,
+            hostclass=None
+        )
+
+    def test_bg_timed_autoscaling_nd(self):
+        '''Blue/green doesn't bother with timed autoscaling for non-deployable hostclasses'''
+        ami = _fake_ami("mhctimedautoscalenodeploy 2")
+        new_group = self.mock_group("mhctimedautoscalenodeploy")
+        self._disco_group.get_existing_group.side_effect = [None, new_group.__dict__]
+        self._disco_group.get_instances.return_value = self._INSTANCE_DICTS
+        self._disco_aws.instances.return_value = self._INSTANCES
+        self._disco_aws.remotecmd.return_value = (0, "")
+        self.assertIsNone(self._ci_deploy.test_ami(ami,
+                                                   deployment_strategy=DEPLOYMENT_STRATEGY_BLUE_GREEN,
+                                                   dry_run=False))
+
+        self._disco_bake.promote_ami.assert_called_once_with(ami, 'tested')
+        expected_config = _spinup_config(hostclass='mhctimedautoscalenodeploy', deployable='no',
+                                         integration_test=None, min_size=3, desired_size=6, max_size=6)
+        self._disco_aws.spinup.assert_called_once_with([expected_config], testing=True,
+                                                       create_if_exists=True)
+        self._disco_aws.create_scaling_schedule.assert_not_called()
+
+
+class DiscoDeployIntegrationTests(DiscoDeployTestBase):
+    '''Test DiscoDeploy integration test and testing mode helpers'''
+
+    def assert_ssm_called(self, document_name, parameters):
+        '''Assert that the last SSM command ran document_name with parameters on i-12345678'''
+        self._ci_deploy._disco_ssm.execute.assert_called_with(
+            instance_ids=["i-12345678"],
+            document_name=document_name,
+            parameters=parameters,
+            comment=ANY
+        )
+
+    def test_integration_tests_with_elb(self):
+        '''Integration tests should wait for ELB'''
+        ami = _fake_ami()
+        self._ci_deploy.get_host = MagicMock()
+        self._disco_aws.remotecmd.return_value = (0, "")
+        self.assertTrue(self._ci_deploy.run_integration_tests(ami, True))
+        self._disco_elb.wait_for_instance_health_state.assert_called_with(hostclass="mhcbluegreen",
+                                                                          testing=True)
+
+    def test_integration_tests_with_elb_timeout(self):
+        '''Integration tests should fail if they can't wait for ELB'''
+        ami = _fake_ami()
+        self._disco_elb.wait_for_instance_health_state.side_effect = _TIMEOUT
+        self.assertFalse(self._ci_deploy.run_integration_tests(ami, True))
+        self._disco_elb.wait_for_instance_health_state.assert_called_with(hostclass="mhcbluegreen",
+                                                                          testing=True)
+
+    def test_pre_test_failure(self):
+        '''Test that an exception is raised if the pre-test fails'''
+        ami = self.mock_ami("mhcintegrated 1 2")
+        self._existing_group.desired_capacity = 2
+        self._ci_deploy.run_integration_tests = MagicMock(return_value=False)
+        self.assertRaises(Exception, self._ci_deploy.test_ami, ami, dry_run=False)
+
+    def test_get_host(self):
+        '''get_host returns a host for the testing hostclass'''
+        self._disco_aws.instances_from_hostclasses.return_value = ["i-12345678"]
+        self.assertEqual(self._ci_deploy.get_host(['test_hostclass']), "i-12345678")
+        self.assertEqual(self._disco_aws.smoketest_once.call_count, 1)
+
+    def test_get_host_raises_on_failure(self):
+        '''get_host raises an IntegrationTestError when a host can not be found'''
+        self._disco_aws.instances_from_hostclasses.return_value = ["i-12345678"]
+        self._disco_aws.smoketest_once.side_effect = _TIMEOUT
+        self.assertRaises(IntegrationTestError, self._ci_deploy.get_host, ['test_hostclass'])
+
+    def test_run_integration_tests_ssh(self):
+        '''run_integration_tests runs the correct command on the correct instance via ssh'''
+        ami = self.mock_ami("mhcintegrated 1 2")
+        self._ci_deploy._disco_aws.remotecmd.return_value = (0, "")
+        self._disco_aws.instances_from_hostclasses.return_value = ["i-12345678"]
+        self.assertEqual(self._ci_deploy.run_integration_tests(ami), True)
+        self._ci_deploy._disco_aws.remotecmd.assert_called_with(
+            "i-12345678", ["test_command", "foo_service"],
+            user="test_user", nothrow=True)
+
+    def test_run_integration_tests_ssm(self):
+        '''run_integration_tests runs the correct command on the correct instance via ssm'''
+        ami = self.mock_ami("mhcssmdocs 1 2")
+        self._disco_aws.instances_from_hostclasses.return_value = [MagicMock(id="i-12345678")]
+        self._ci_deploy._disco_ssm.execute.return_value = True
+        self.assertEqual(self._ci_deploy.run_integration_tests(ami), True)
+        self.assert_ssm_called(SSM_DOC_INTEGRATION_TESTS, {
+            "command": ["test_command"],
+            "test": ["ssm_service"],
+            "user": ["test_user"]
+        })
+
+    @parameterized.expand([
+        ("succeeds", True),
+        ("fails", False)
+    ])
+    def test_setting_testing_mode_ssm(self, _, executed):
+        '''toggles testing mode via ssm, failing if execute fails'''
+        self._ci_deploy._disco_ssm.execute.return_value = executed
+        self.assertEqual(
+            self._ci_deploy._set_testing_mode(
+                "mhcssmdocs",
+                [MagicMock(id="i-12345678")],
+                True
+            ),
+            executed
+        )
+        self.assert_ssm_called(SSM_DOC_TESTING_MODE, {"mode": ["on"]})
+
+    def test_run_integration_tests_get_host_fail(self):
+        '''run_integration_tests raises exception when a get_host fails to find a host'''
+        ami = self.mock_ami("mhcintegrated 1 2")
+        self._ci_deploy._disco_aws.remotecmd.return_value = (0, "")
+        self._disco_aws.instances_from_hostclasses.return_value = []
+        self.assertRaises(IntegrationTestError, self._ci_deploy.run_integration_tests, ami)
+
+
+class DiscoDeployInstanceTests(DiscoDeployTestBase):
+    '''Test DiscoDeploy selection of old and new instances'''
+
+    def launched_instances(self, now, image_ids):
+        '''Returns one instance launched after now and one launched a day before it, running image_ids'''
+        new_inst = self.mock_instance()
+        new_inst.launch_time = str(now + timedelta(minutes=10))
+        old_inst = self.mock_instance()
+        old_inst.launch_time = str(now - timedelta(days=1))
+        instances = [new_inst, old_inst]
+        for inst, image_id in zip(instances, image_ids):
+            inst.image_id = image_id
+        return instances
+
+    def test_get_latest_other_image_id_1(self):
+        '''_get_latest_other_image_id uses amis of old deployed instances'''
+        ami = self.mock_ami("mhcabc 1")
+        inst2 = self.mock_instance()
+        inst2.image_id = ami.id
+        self._ci_deploy._get_old_instances = lambda *args, **kwargs: [inst2]
+        self._ci_deploy._disco_bake.get_amis.return_value = [ami]
+        self.assertEqual(self._ci_deploy._get_latest_other_image_id('ami-11112222'), ami.id)
+        self._ci_deploy._disco_bake.get_amis.assert_called_with(image_ids=[inst2.image_id])
+
+    def test_get_latest_other_image_id_2(self):
+        '''_get_latest_other_image_id returns latest of multiple amis'''
+        amis = [self.mock_ami("mhcabc 1"), self.mock_ami("mhcabc 3"), self.mock_ami("mhcabc 2")]
+        insts = [self.mock_instance() for _ in range(3)]
+        for index in range(3):
+            insts[index].image_id = amis[index].id
+        self._ci_deploy._get_old_instances = lambda *args, **kwargs: insts
+        self._ci_deploy._disco_bake.get_amis.return_value = amis
+        self.assertEqual(self._ci_deploy._get_latest_other_image_id('ami-11112222'), amis[1].id)
+
+    @parameterized.expand([
+        ("with_launch_time", True, [0]),
+        ("no_launch_time", False, [0, 1])
+    ])
+    def test_get_new_instances(self, _, use_launch_time, expected):
+        '''test get new instances with and without launch time'''
+        now = self._NOW
+        ami_id = "ami-12345678"
+        instances = self.launched_instances(now, [ami_id, ami_id])
+
+        self._disco_aws.instances.return_value = instances
+        self.assertEqual(self._ci_deploy._get_new_instances(ami_id, now if use_launch_time else None),
+                         [instances[index] for index in expected])
+
+    @parameterized.expand([
+        ("with_launch_time", True, "ami-12345678"),
+        ("no_launch_time", False, "ami-12345699")
+    ])
+    def test_get_old_instances(self, _, use_launch_time, old_image_id):
+        '''test get old instances with and without launch time'''
+        now = self._NOW
+        ami_id = "ami-12345678"
+        instances = self.launched_instances(now, [ami_id, old_image_id])
+
+        self._disco_aws.instances.return_value = instances
+        self.assertEqual(self._ci_deploy._get_old_instances(ami_id, now if use_launch_time else None),
+                         [instances[1]])